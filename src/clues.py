@@ -0,0 +1,115 @@
+from collections import namedtuple
+
+# ================================
+# CLUE REPRESENTATION
+# ================================
+#
+# kind:   "same"     -> first and second are in the same house
+#         "next_to"  -> first and second are in neighbouring houses
+#         "left_of"  -> first is immediately to the left of second
+#         "position" -> first is in house number 'second' (0-based)
+# first:  (attribute, value)
+# second: (attribute, value), or a house index for "position"
+Clue = namedtuple("Clue", ["kind", "first", "second"])
+
+ZEBRA_CLUES = [
+    Clue("same", ("nationality", "englishman"), ("color", "red")),        # 2
+    Clue("same", ("nationality", "spaniard"), ("pet", "dog")),            # 3
+    Clue("same", ("color", "green"), ("drink", "coffee")),                # 4
+    Clue("same", ("nationality", "ukrainian"), ("drink", "tea")),         # 5
+    Clue("left_of", ("color", "ivory"), ("color", "green")),              # 6
+    Clue("same", ("pet", "snails"), ("hobby", "dancing")),                # 7
+    Clue("same", ("color", "yellow"), ("hobby", "painter")),              # 8
+    Clue("position", ("drink", "milk"), 2),                               # 9
+    Clue("position", ("nationality", "norwegian"), 0),                    # 10
+    Clue("next_to", ("hobby", "reading"), ("pet", "fox")),                # 11
+    Clue("next_to", ("hobby", "painter"), ("pet", "horse")),              # 12
+    Clue("same", ("hobby", "football"), ("drink", "orange juice")),       # 13
+    Clue("same", ("nationality", "japanese"), ("hobby", "chess")),        # 14
+    Clue("next_to", ("nationality", "norwegian"), ("color", "blue")),     # 15
+]
+
+
+def clue_attrs(clue):
+    """Attributes a clue talks about."""
+    if clue.kind == "position":
+        return {clue.first[0]}
+    return {clue.first[0], clue.second[0]}
+
+
+def is_cross_house(clue):
+    """True for clues relating two different houses."""
+    return clue.kind in ("next_to", "left_of")
+
+
+def clue_to_json(clue):
+    """Clue -> plain JSON-friendly list."""
+    second = clue.second if clue.kind == "position" else list(clue.second)
+    return [clue.kind, list(clue.first), second]
+
+
+def clue_from_json(data):
+    """Inverse of clue_to_json."""
+    kind, first, second = data
+    return Clue(kind, tuple(first), second if kind == "position" else tuple(second))
+
+# ================================
+# CLUE CHECKS
+# ================================
+
+def find_house(solution, attr, value):
+    """Index of the house holding attr=value, or None if not placed yet."""
+    for i, house in enumerate(solution):
+        if house.get(attr) == value:
+            return i
+    return None
+
+
+def clue_holds(clue, solution):
+    """
+    Check a clue against a (partial) solution.
+    Returns False only if the assigned values already violate it.
+    """
+    attr, value = clue.first
+    i = find_house(solution, attr, value)
+
+    if clue.kind == "position":
+        if i is not None:
+            return i == clue.second
+        return solution[clue.second].get(attr) in (None, value)
+
+    attr2, value2 = clue.second
+    j = find_house(solution, attr2, value2)
+    last = len(solution) - 1
+
+    if clue.kind == "same":
+        if i is not None and j is not None:
+            return i == j
+        if i is not None:
+            return solution[i].get(attr2) in (None, value2)
+        if j is not None:
+            return solution[j].get(attr) in (None, value)
+        return True
+
+    if clue.kind == "left_of":
+        if i is not None and j is not None:
+            return j == i + 1
+        if i is not None:
+            return i < last and solution[i + 1].get(attr2) in (None, value2)
+        if j is not None:
+            return j > 0 and solution[j - 1].get(attr) in (None, value)
+        return True
+
+    # next_to
+    if i is not None and j is not None:
+        return abs(i - j) == 1
+    if i is not None:
+        return any(solution[n].get(attr2) in (None, value2) for n in (i - 1, i + 1) if 0 <= n <= last)
+    if j is not None:
+        return any(solution[n].get(attr) in (None, value) for n in (j - 1, j + 1) if 0 <= n <= last)
+    return True
+
+
+def clues_hold(clues, solution):
+    """True if no clue is violated by the (partial) solution."""
+    return all(clue_holds(clue, solution) for clue in clues)
@@ -7,3 +7,12 @@ PETS = ["dog", "snails", "fox", "horse", "zebra"]
 HOBBIES = ["dancing", "painter", "reading", "football", "chess"]
 
 HOUSE_COUNT = 5
+
+# Attribute name -> value list, in the order houses are filled
+ATTRIBUTES = {
+    "color": COLORS,
+    "nationality": NATIONALITIES,
+    "drink": DRINKS,
+    "pet": PETS,
+    "hobby": HOBBIES
+}
@@ -1,4 +1,5 @@
-from config import COLORS, NATIONALITIES, DRINKS, PETS, HOBBIES, HOUSE_COUNT
+from config import COLORS, NATIONALITIES, DRINKS, PETS, HOBBIES, HOUSE_COUNT, ATTRIBUTES
+from clues import ZEBRA_CLUES, clue_holds, clues_hold, clue_attrs
 
 # ================================
 # CSP SOLVER WITH PRUNING + MRV
@@ -114,6 +115,42 @@ def select_unassigned_variable(solution, domains):
     return choice
 
 
+def init_domains(partial_solution):
+    """Domains for every (house, attribute), minus values already used by other houses."""
+    domains = []
+    for i in range(HOUSE_COUNT):
+        row = {}
+        for attr, values in ATTRIBUTES.items():
+            used = {partial_solution[j][attr] for j in range(HOUSE_COUNT)
+                    if j != i and attr in partial_solution[j]}
+            row[attr] = set(values) - used
+        domains.append(row)
+    return domains
+
+
+def prune_domains(solution, domains):
+    """
+    One-step lookahead: drop every value whose assignment would immediately
+    violate a clue according to is_valid_partial. Domains are pruned in place.
+    Returns False if an unassigned slot is left with no value.
+    """
+    for house_idx in range(HOUSE_COUNT):
+        house = solution[house_idx]
+        for attr in ATTRIBUTES:
+            if attr in house:
+                continue
+            consistent = set()
+            for value in domains[house_idx][attr]:
+                house[attr] = value
+                if is_valid_partial(solution):
+                    consistent.add(value)
+            house.pop(attr, None)
+            domains[house_idx][attr] = consistent
+            if not consistent:
+                return False
+    return True
+
+
 def backtrack(solution, domains):
     """Recursive backtracking with forward checking."""
     # Check if solution is complete
@@ -155,23 +192,339 @@ def solve_csp():
     return backtrack(solution, domains)
 
 
-def complete_with_csp(partial_solution):
+def complete_with_csp(partial_solution, backjumping=False):
     """
     Takes a partially filled state and completes it using CSP.
     Useful for MCTS rollouts or hybrid solving.
+    With backjumping=True, uses conflict-directed backjumping and the shared nogood cache.
     """
+    if backjumping:
+        return backjump(partial_solution)
+
     # Start with partial solution
     solution = [dict(h) for h in partial_solution]
 
     # Initialize domains and remove used values
-    domains = []
-    for i in range(HOUSE_COUNT):
-        domains.append({
-            "color": set(COLORS) - {solution[j].get("color") for j in range(HOUSE_COUNT) if j != i and "color" in solution[j]},
-            "nationality": set(NATIONALITIES) - {solution[j].get("nationality") for j in range(HOUSE_COUNT) if j != i and "nationality" in solution[j]},
-            "drink": set(DRINKS) - {solution[j].get("drink") for j in range(HOUSE_COUNT) if j != i and "drink" in solution[j]},
-            "pet": set(PETS) - {solution[j].get("pet") for j in range(HOUSE_COUNT) if j != i and "pet" in solution[j]},
-            "hobby": set(HOBBIES) - {solution[j].get("hobby") for j in range(HOUSE_COUNT) if j != i and "hobby" in solution[j]},
-        })
+    domains = init_domains(solution)
 
     return backtrack(solution, domains)
+
+
+# ================================
+# CONFLICT-DIRECTED BACKJUMPING
+# ================================
+
+class NogoodStore:
+    """
+    Learned nogoods: sets of (house_index, attr, value) assignments that can
+    never hold together. Indexed by assignment so that only nogoods touching
+    the value being tried are checked.
+    """
+
+    def __init__(self, max_size=4):
+        self.max_size = max_size   # Larger nogoods are rarely matched again
+        self.by_literal = {}
+        self.count = 0
+
+    def add(self, nogood):
+        if not nogood or len(nogood) > self.max_size:
+            return
+        nogood = frozenset(nogood)
+        first = next(iter(nogood))
+        if nogood in self.by_literal.get(first, ()):
+            return
+        for literal in nogood:
+            self.by_literal.setdefault(literal, set()).add(nogood)
+        self.count += 1
+
+    def matching(self, literal):
+        return self.by_literal.get(literal, ())
+
+
+# Nogoods only hold for the clue set they were learned from
+_NOGOOD_STORES = {}
+
+
+def learned_nogoods(clues=ZEBRA_CLUES):
+    """Nogood cache shared by every backjump() call on the same clues."""
+    return _NOGOOD_STORES.setdefault(tuple(clues), NogoodStore())
+
+
+def backjump(partial_solution, clues=ZEBRA_CLUES, nogoods=None):
+    """
+    Complete a partial solution with conflict-directed backjumping (CBJ).
+
+    Every failed value records which earlier assignments caused it. When a
+    slot runs out of values, the search jumps straight back to the most
+    recent culprit instead of the previous slot, and the culprits' values are
+    stored as a nogood so the same combination is never tried again, also in
+    later calls on the same clues.
+    """
+    solution = [dict(h) for h in partial_solution]
+    nogoods = learned_nogoods(clues) if nogoods is None else nogoods
+    clues_by_attr = {attr: [c for c in clues if attr in clue_attrs(c)] for attr in ATTRIBUTES}
+
+    for attr in ATTRIBUTES:
+        assigned = [h[attr] for h in solution if attr in h]
+        if len(assigned) != len(set(assigned)):
+            return None  # All-different is already violated
+    if not clues_hold(clues, solution):
+        return None
+
+    def conflicts(house_idx, attr, value):
+        """Slots responsible if house_idx.attr = value fails, or None if it is consistent."""
+        for j in range(HOUSE_COUNT):
+            if j != house_idx and solution[j].get(attr) == value:
+                return {(j, attr)}
+
+        solution[house_idx][attr] = value
+        try:
+            for clue in clues_by_attr[attr]:
+                if not clue_holds(clue, solution):
+                    return {(k, a) for a in clue_attrs(clue) for k in range(HOUSE_COUNT)
+                            if a in solution[k] and (k, a) != (house_idx, attr)}
+            for nogood in nogoods.matching((house_idx, attr, value)):
+                rest = [(k, a, v) for k, a, v in nogood if (k, a) != (house_idx, attr)]
+                if all(solution[k].get(a) == v for k, a, v in rest):
+                    return {(k, a) for k, a, _ in rest}
+        finally:
+            del solution[house_idx][attr]
+        return None
+
+    def choose():
+        """Unassigned slot with the fewest values left by all-different."""
+        best, best_count = None, None
+        for house_idx in range(HOUSE_COUNT):
+            for attr, values in ATTRIBUTES.items():
+                if attr in solution[house_idx]:
+                    continue
+                used = {h.get(attr) for h in solution}
+                count = sum(1 for v in values if v not in used)
+                if best is None or count < best_count:
+                    best, best_count = (house_idx, attr), count
+        return best
+
+    def search():
+        """Returns None on success, or the conflict set of the failure."""
+        var = choose()
+        if var is None:
+            return None
+        house_idx, attr = var
+
+        conflict_set = set()
+        for value in ATTRIBUTES[attr]:
+            culprits = conflicts(house_idx, attr, value)
+            if culprits is not None:
+                conflict_set |= culprits
+                continue
+
+            solution[house_idx][attr] = value
+            below = search()
+            if below is None:
+                return None
+            del solution[house_idx][attr]
+
+            if var not in below:
+                return below  # This slot is not to blame: jump past it
+            conflict_set |= below - {var}
+
+        nogoods.add({(k, a, solution[k][a]) for k, a in conflict_set})
+        return conflict_set
+
+    return solution if search() is None else None
+
+# ================================
+# CLUE PROPAGATION
+# ================================
+
+def revise_clue(clue, domains):
+    """Remove values that can no longer satisfy 'clue'. Returns True if a domain changed."""
+    changed = False
+    house_count = len(domains)
+
+    def remove(h, attr, value):
+        nonlocal changed
+        if value in domains[h][attr]:
+            domains[h][attr].discard(value)
+            changed = True
+
+    def restrict(h, attr, value):
+        nonlocal changed
+        if domains[h][attr] - {value}:
+            domains[h][attr] &= {value}
+            changed = True
+
+    attr, value = clue.first
+    if clue.kind == "position":
+        for h in range(house_count):
+            if h == clue.second:
+                restrict(h, attr, value)
+            else:
+                remove(h, attr, value)
+        return changed
+
+    attr2, value2 = clue.second
+    for h in range(house_count):
+        if clue.kind == "same":
+            if value not in domains[h][attr]:
+                remove(h, attr2, value2)
+            if value2 not in domains[h][attr2]:
+                remove(h, attr, value)
+            if domains[h][attr] == {value}:
+                restrict(h, attr2, value2)
+            if domains[h][attr2] == {value2}:
+                restrict(h, attr, value)
+        elif clue.kind == "left_of":
+            if h == house_count - 1 or value2 not in domains[h + 1][attr2]:
+                remove(h, attr, value)
+            if h == 0 or value not in domains[h - 1][attr]:
+                remove(h, attr2, value2)
+        else:  # next_to
+            neighbors = [n for n in (h - 1, h + 1) if 0 <= n < house_count]
+            if not any(value2 in domains[n][attr2] for n in neighbors):
+                remove(h, attr, value)
+            if not any(value in domains[n][attr] for n in neighbors):
+                remove(h, attr2, value2)
+    return changed
+
+
+def revise_all_different(domains):
+    """
+    All-different on every attribute: assigned values leave the other houses,
+    and a value possible in only one house is assigned there.
+    Returns True/False for changed, or None if some value fits nowhere.
+    """
+    changed = False
+    for attr, values in ATTRIBUTES.items():
+        for value in values:
+            houses = [h for h, row in enumerate(domains) if value in row[attr]]
+            if not houses:
+                return None
+            if len(houses) == 1 and len(domains[houses[0]][attr]) > 1:
+                domains[houses[0]][attr] = {value}
+                changed = True
+        for h, row in enumerate(domains):
+            if len(row[attr]) == 1:
+                (value,) = row[attr]
+                for other, other_row in enumerate(domains):
+                    if other != h and value in other_row[attr]:
+                        other_row[attr].discard(value)
+                        changed = True
+    return changed
+
+
+def propagate(domains, clues):
+    """Run clue and all-different revision to a fixpoint, in place. False on a wipeout."""
+    changed = True
+    while changed:
+        changed = False
+        for clue in clues:
+            changed |= revise_clue(clue, domains)
+        result = revise_all_different(domains)
+        if result is None:
+            return False
+        changed |= result
+        if any(not values for row in domains for values in row.values()):
+            return False
+    return True
+
+
+def copy_domains(domains):
+    return [{k: v.copy() for k, v in row.items()} for row in domains]
+
+
+# ================================
+# INCREMENTAL SOLVER SESSION
+# ================================
+
+class CSPSession:
+    """
+    Stateful solver for interactive use: clues and fixed assignments are added
+    or removed one at a time, and the propagated domains and last solution are
+    kept between calls.
+
+    - Adding a clue or fixing a slot only tightens the current domains, so it
+      is propagated from where the session already is. If the last solution
+      still satisfies the change, it is reused without any search.
+    - Otherwise solve() searches again, trying the previous solution's value
+      first at every choice point, so it only deviates where it has to.
+    - Removing a clue or unfixing a slot rebuilds the domains, but the last
+      solution stays valid and is kept. Re-fixing a slot to another value
+      also rebuilds.
+    """
+
+    def __init__(self, clues=None):
+        self.clues = list(clues or [])
+        self.fixed = {}            # (house_index, attr) -> value
+        self.domains = None
+        self.consistent = True
+        self.solution = None       # Last solution, None if invalidated
+        self.hint = None           # Last solution, kept as value ordering hint
+        self.searches = 0          # Number of solve() calls that had to search
+        self.nodes = 0             # Search nodes expanded over the whole session
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute propagated domains from scratch."""
+        self.domains = [{attr: set(values) for attr, values in ATTRIBUTES.items()} for _ in range(HOUSE_COUNT)]
+        for (house_idx, attr), value in self.fixed.items():
+            self.domains[house_idx][attr] &= {value}
+        self.consistent = propagate(self.domains, self.clues)
+
+    def add_clue(self, clue):
+        self.clues.append(clue)
+        if self.consistent:
+            self.consistent = propagate(self.domains, self.clues)
+        if self.solution is not None and not clue_holds(clue, self.solution):
+            self.solution = None
+
+    def remove_clue(self, clue):
+        self.clues.remove(clue)
+        self.rebuild()
+
+    def fix(self, house_idx, attr, value):
+        previous = self.fixed.get((house_idx, attr))
+        self.fixed[(house_idx, attr)] = value
+        if previous not in (None, value):
+            self.rebuild()  # Re-fixing loosens the old value, so tightening is not enough
+        elif self.consistent:
+            self.domains[house_idx][attr] &= {value}
+            self.consistent = propagate(self.domains, self.clues)
+        if self.solution is not None and self.solution[house_idx][attr] != value:
+            self.solution = None
+
+    def unfix(self, house_idx, attr):
+        self.fixed.pop((house_idx, attr), None)
+        self.rebuild()
+
+    def solve(self):
+        """Return a solution (list of house dicts) for the current clues, or None."""
+        if not self.consistent:
+            return None
+        if self.solution is None:
+            self.searches += 1
+            self.solution = self.search(copy_domains(self.domains))
+            if self.solution is not None:
+                self.hint = self.solution
+        return [dict(h) for h in self.solution] if self.solution else None
+
+    def search(self, domains):
+        self.nodes += 1
+        open_slots = [(len(row[attr]), h, attr) for h, row in enumerate(domains)
+                      for attr in ATTRIBUTES if len(row[attr]) > 1]
+        if not open_slots:
+            solution = [{attr: next(iter(row[attr])) for attr in ATTRIBUTES} for row in domains]
+            return solution if clues_hold(self.clues, solution) else None
+
+        _, house_idx, attr = min(open_slots)
+        preferred = self.hint[house_idx][attr] if self.hint else None
+        values = sorted(domains[house_idx][attr],
+                        key=lambda v: (v != preferred, ATTRIBUTES[attr].index(v)))
+        for value in values:
+            new_domains = copy_domains(domains)
+            new_domains[house_idx][attr] = {value}
+            if propagate(new_domains, self.clues):
+                result = self.search(new_domains)
+                if result:
+                    return result
+        return None
@@ -0,0 +1,331 @@
+from itertools import chain
+import numpy as np
+from config import ATTRIBUTES, HOUSE_COUNT
+from clues import ZEBRA_CLUES, is_cross_house
+
+# ================================
+# DANCING LINKS (ALGORITHM X)
+# ================================
+
+class DancingLinks:
+    """
+    Knuth's Algorithm X on a toroidal doubly-linked matrix, stored in flat lists.
+    Node 0 is the root, nodes 1..n_columns are the column headers.
+    Only the first 'primary' columns must be covered; the rest are secondary
+    columns (covered at most once) and are never branched on.
+    A matrix is consumed by a single search; build a new one per query.
+    """
+
+    def __init__(self, n_columns, rows, primary=None):
+        # Links are computed with NumPy in one pass, then kept as plain lists,
+        # which are faster than arrays for the scalar updates in cover/uncover.
+        size = n_columns + 1
+        lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+        cols = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=int(lengths.sum())) + 1
+        total = size + len(cols)
+        nodes = np.arange(size, total)
+
+        # Horizontal: each row is a contiguous, circular range of nodes
+        starts = size + np.cumsum(lengths) - lengths
+        first = np.repeat(starts, lengths)
+        last = np.repeat(starts + lengths - 1, lengths)
+        L = np.concatenate((np.arange(-1, size - 1), np.where(nodes == first, last, nodes - 1)))
+        R = np.concatenate((np.arange(1, size + 1), np.where(nodes == last, first, nodes + 1)))
+        primary = n_columns if primary is None else primary
+        L[0] = primary
+        R[primary] = 0
+        L[primary + 1:size] = R[primary + 1:size] = np.arange(primary + 1, size)
+
+        # Vertical: nodes of each column in row order, closed through the header
+        U = np.arange(total)
+        D = np.arange(total)
+        order = nodes[np.argsort(cols, kind="stable")]
+        if len(order):
+            col_of = cols[order - size]
+            same = col_of[1:] == col_of[:-1]
+            D[order[:-1]] = np.where(same, order[1:], col_of[:-1])
+            D[order[-1]] = col_of[-1]
+            U[order[1:]] = np.where(same, order[:-1], col_of[1:])
+            U[order[0]] = col_of[0]
+            group_start = np.flatnonzero(np.concatenate(([True], ~same)))
+            group_end = np.concatenate((group_start[1:] - 1, [len(order) - 1]))
+            D[col_of[group_start]] = order[group_start]
+            U[col_of[group_start]] = order[group_end]
+
+        self.L = L.tolist()
+        self.R = R.tolist()
+        self.U = U.tolist()
+        self.D = D.tolist()
+        self.C = np.concatenate((np.arange(size), cols)).tolist()
+        self.S = np.bincount(cols, minlength=size).tolist()
+        self.row_of = [-1] * size + np.repeat(np.arange(len(rows)), lengths).tolist()
+
+    def cover(self, col):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[col]] = R[col]
+        L[R[col]] = L[col]
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, col):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[col]] = col
+        L[R[col]] = col
+
+    def search(self, chosen=None):
+        """Yield every exact cover as a list of row ids."""
+        if chosen is None:
+            chosen = []
+        R, D, S = self.R, self.D, self.S
+
+        if R[0] == 0:
+            yield list(chosen)
+            return
+
+        # Pick the column with the fewest candidate rows
+        col = R[0]
+        best, best_size = col, S[col]
+        while col != 0 and best_size > 0:
+            if S[col] < best_size:
+                best, best_size = col, S[col]
+            col = R[col]
+        if best_size == 0:
+            return
+
+        self.cover(best)
+        r = D[best]
+        while r != best:
+            chosen.append(self.row_of[r])
+            j = R[r]
+            while j != r:
+                self.cover(self.C[j])
+                j = R[j]
+            yield from self.search(chosen)
+            j = self.L[r]
+            while j != r:
+                self.uncover(self.C[j])
+                j = self.L[j]
+            chosen.pop()
+            r = D[r]
+        self.uncover(best)
+
+# ================================
+# ZEBRA PUZZLE AS EXACT COVER
+# ================================
+#
+# Columns: one per house, one per (attribute, value).
+# Rows:    one per (house, full attribute assignment) that survives the
+#          single-house clues ("same", "position"), the single-house parts of
+#          the other clues, and any fixed values.
+# Clues relating two houses ("next_to", "left_of") become secondary columns
+# shared by the rows that would place their two values in incompatible houses.
+
+def compile_row_checks(attributes, house_count, clues, index):
+    """
+    Turn the clues into per-attribute checks for house 'index'. For attribute k:
+    - required: value it must take (or None)
+    - forbidden: values it can never take
+    - pairs: (earlier_attr, earlier_value, value, must_match) meaning
+      "house[earlier_attr] == earlier_value" must equal (must_match=True) or
+      must not coincide with (must_match=False) "this attribute == value".
+    """
+    attr_names = list(attributes)
+    level = {attr: k for k, attr in enumerate(attr_names)}
+    required = [None] * len(attr_names)
+    forbidden = [set() for _ in attr_names]
+    pairs = [[] for _ in attr_names]
+
+    for clue in clues:
+        attr, value = clue.first
+        if attr not in level:
+            continue
+        if clue.kind == "position":
+            if index == clue.second:
+                if required[level[attr]] not in (None, value):
+                    forbidden[level[attr]].update(attributes[attr])
+                required[level[attr]] = value
+            else:
+                forbidden[level[attr]].add(value)
+            continue
+
+        attr2, value2 = clue.second
+        if attr2 not in level:
+            continue
+        if clue.kind == "left_of":
+            if index == house_count - 1:
+                forbidden[level[attr]].add(value)
+            if index == 0:
+                forbidden[level[attr2]].add(value2)
+        elif house_count == 1:
+            forbidden[level[attr]].add(value)
+            forbidden[level[attr2]].add(value2)
+
+        must_match = clue.kind == "same"
+        if attr == attr2:
+            # One value per attribute: "same" on two different values can never hold
+            if must_match and value != value2:
+                forbidden[level[attr]].update({value, value2})
+            continue
+        # Attach the pair to whichever attribute is assigned last
+        if level[attr] < level[attr2]:
+            pairs[level[attr2]].append((attr, value, value2, must_match))
+        else:
+            pairs[level[attr]].append((attr2, value2, value, must_match))
+    return required, forbidden, pairs
+
+
+def build_rows(attributes=ATTRIBUTES, house_count=HOUSE_COUNT, clues=ZEBRA_CLUES, partial=None):
+    """Return [(house_index, house_dict)] for every allowed house configuration."""
+    attr_names = list(attributes)
+    depth = len(attr_names)
+    rows = []
+
+    for index in range(house_count):
+        fixed = partial[index] if partial else {}
+        required, forbidden, pairs = compile_row_checks(attributes, house_count, clues, index)
+        candidates = []
+        for k, attr in enumerate(attr_names):
+            values = [fixed[attr]] if attr in fixed else attributes[attr]
+            if required[k] is not None:
+                values = [v for v in values if v == required[k]]
+            candidates.append([v for v in values if v not in forbidden[k]])
+
+        def extend(house, k):
+            if k == depth:
+                rows.append((index, dict(house)))
+                return
+            for value in candidates[k]:
+                for attr, earlier, wanted, must_match in pairs[k]:
+                    hit = house[attr] == earlier
+                    if (hit != (value == wanted)) if must_match else (hit and value == wanted):
+                        break
+                else:
+                    house[attr_names[k]] = value
+                    extend(house, k + 1)
+            house.pop(attr_names[k], None)
+
+        extend({}, 0)
+    return rows
+
+
+def prune_rows(rows, clues, house_count):
+    """
+    Filter rows by the houses each (attribute, value) can still occupy, to a fixpoint:
+    cross-house clues restrict a value to houses next to (or right of) the
+    houses of its partner, and a value left with a single house forces
+    every row of that house to contain it.
+    """
+    cross = [clue for clue in clues if is_cross_house(clue)]
+    while True:
+        houses = {}
+        for index, house in rows:
+            for item in house.items():
+                houses.setdefault(item, set()).add(index)
+
+        for clue in cross:
+            a, b = houses.get(clue.first, set()), houses.get(clue.second, set())
+            if clue.kind == "left_of":
+                a_next, b_next = {i - 1 for i in b}, {i + 1 for i in a}
+            else:
+                a_next = {n for i in b for n in (i - 1, i + 1)}
+                b_next = {n for i in a for n in (i - 1, i + 1)}
+            a &= a_next
+            b &= b_next
+
+        forced = [set() for _ in range(house_count)]
+        for item, places in houses.items():
+            if len(places) == 1:
+                forced[next(iter(places))].add(item)
+
+        kept = [(index, house) for index, house in rows
+                if all(index in houses[item] for item in house.items())
+                and all(house.get(attr) == value for attr, value in forced[index])]
+        if len(kept) == len(rows):
+            return rows
+        rows = kept
+
+
+def cross_house_columns(clues, house_count):
+    """
+    Secondary columns for the clues relating two houses: one per clue and
+    pair of houses (i, j) the two values may not occupy together, so picking
+    a row for one value removes the other value from every disallowed house.
+    Returns {(attr, value): [(column_key, house_index)]}.
+    """
+    columns = {}
+    for n, clue in enumerate(clue for clue in clues if is_cross_house(clue)):
+        for i in range(house_count):
+            for j in range(house_count):
+                allowed = j == i + 1 or (clue.kind == "next_to" and j == i - 1)
+                if i == j or allowed:
+                    continue
+                key = ("cross", n, i, j)
+                columns.setdefault(clue.first, []).append((key, i))
+                columns.setdefault(clue.second, []).append((key, j))
+    return columns
+
+
+def enumerate_dlx(partial=None, clues=ZEBRA_CLUES, attributes=ATTRIBUTES, house_count=HOUSE_COUNT):
+    """Yield every solution, each in the same format as solve_csp()."""
+    column = {}
+    for i in range(house_count):
+        column[("house", i)] = len(column)
+    for attr, values in attributes.items():
+        for value in values:
+            column[(attr, value)] = len(column)
+    primary = len(column)
+
+    cross = cross_house_columns(clues, house_count)
+    for links in cross.values():
+        for key, _ in links:
+            column.setdefault(key, len(column))
+
+    # A fixed slot holding an unknown value can never be covered
+    rows = [(index, house) for index, house in build_rows(attributes, house_count, clues, partial)
+            if all(item in column for item in house.items())]
+    rows = prune_rows(rows, clues, house_count)
+    matrix = []
+    for index, house in rows:
+        line = [column[("house", index)]] + [column[item] for item in house.items()]
+        for item in house.items():
+            line.extend(column[key] for key, i in cross.get(item, ()) if i == index)
+        matrix.append(line)
+
+    dlx = DancingLinks(len(column), matrix, primary)
+    for chosen in dlx.search():
+        solution = [None] * house_count
+        for row_id in chosen:
+            index, house = rows[row_id]
+            solution[index] = dict(house)
+        yield solution
+
+
+def solve_dlx(partial=None, clues=ZEBRA_CLUES, attributes=ATTRIBUTES, house_count=HOUSE_COUNT):
+    """First solution (list of house dicts) or None."""
+    return next(enumerate_dlx(partial, clues, attributes, house_count), None)
+
+
+def count_dlx(partial=None, clues=ZEBRA_CLUES, attributes=ATTRIBUTES, house_count=HOUSE_COUNT, limit=None):
+    """Number of solutions, stopping early once 'limit' is reached."""
+    count = 0
+    for _ in enumerate_dlx(partial, clues, attributes, house_count):
+        count += 1
+        if limit is not None and count >= limit:
+            break
+    return count
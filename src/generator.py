@@ -0,0 +1,136 @@
+import json
+import random
+import argparse
+from config import ATTRIBUTES, HOUSE_COUNT
+from clues import Clue, clue_to_json, clue_from_json
+from dlx_solver import count_dlx
+
+# ================================
+# PUZZLE INSTANCE GENERATOR
+# ================================
+#
+# 1. Sample a random solution for the requested size.
+# 2. Derive every true clue from the templates (same house, next to,
+#    immediately left of, position) and draw them in random order, picking
+#    a random template for each, until the DLX counter reports a unique
+#    solution.
+# 3. Greedily drop clues while the solution stays unique.
+#
+# Uniqueness checks use count_dlx(limit=2), which stops at the second
+# solution. Generation time is dominated by these checks.
+
+TEMPLATES = ("same", "next_to", "left_of", "position")
+
+
+def make_attributes(house_count=HOUSE_COUNT, attribute_count=len(ATTRIBUTES)):
+    """Attribute -> values for the given size, reusing config.py names where possible."""
+    names = list(ATTRIBUTES) + [f"attribute{k}" for k in range(len(ATTRIBUTES), attribute_count)]
+    attributes = {}
+    for name in names[:attribute_count]:
+        known = ATTRIBUTES.get(name, [])[:house_count]
+        attributes[name] = known + [f"{name}_{i}" for i in range(len(known), house_count)]
+    return attributes
+
+
+def sample_solution(attributes, house_count, rng):
+    solution = [dict() for _ in range(house_count)]
+    for attr, values in attributes.items():
+        for house, value in zip(solution, rng.sample(values, house_count)):
+            house[attr] = value
+    return solution
+
+
+def candidate_clues(solution, attributes):
+    """Every clue from the templates that is true for 'solution', grouped by template."""
+    attrs = list(attributes)
+    house_count = len(solution)
+    candidates = {kind: [] for kind in TEMPLATES}
+
+    for h, house in enumerate(solution):
+        for i, a in enumerate(attrs):
+            candidates["position"].append(Clue("position", (a, house[a]), h))
+            for b in attrs[i + 1:]:
+                candidates["same"].append(Clue("same", (a, house[a]), (b, house[b])))
+        if h + 1 < house_count:
+            right = solution[h + 1]
+            for a in attrs:
+                for b in attrs:
+                    candidates["left_of"].append(Clue("left_of", (a, house[a]), (b, right[b])))
+                    candidates["next_to"].append(Clue("next_to", (a, house[a]), (b, right[b])))
+    return candidates
+
+
+def is_unique(clues, attributes, house_count):
+    return count_dlx(clues=clues, attributes=attributes, house_count=house_count, limit=2) == 1
+
+
+def generate_instance(house_count=HOUSE_COUNT, attribute_count=len(ATTRIBUTES), seed=None):
+    """Return one instance dict with a uniquely solvable, greedily minimized clue set."""
+    rng = random.Random(seed)
+    attributes = make_attributes(house_count, attribute_count)
+    solution = sample_solution(attributes, house_count, rng)
+    candidates = candidate_clues(solution, attributes)
+    for pool in candidates.values():
+        rng.shuffle(pool)
+
+    # Grow: draw batches of clues until the set is unique. A generous first
+    # batch skips the slow checks on loosely constrained sets.
+    clues = []
+    batch = house_count * attribute_count
+    while True:
+        for _ in range(batch):
+            kinds = [k for k in TEMPLATES if candidates[k]]
+            if kinds:
+                clues.append(candidates[rng.choice(kinds)].pop())
+        if is_unique(clues, attributes, house_count):
+            break
+        batch = max(1, len(clues) // 2)
+
+    # Shrink: drop every clue the solution does not depend on
+    for clue in rng.sample(clues, len(clues)):
+        remaining = [c for c in clues if c != clue]
+        if is_unique(remaining, attributes, house_count):
+            clues = remaining
+
+    return {
+        "seed": seed,
+        "house_count": house_count,
+        "attributes": attributes,
+        "clues": [clue_to_json(c) for c in clues],
+        "solution": solution,
+    }
+
+
+def write_instances(path, count, house_count=HOUSE_COUNT, attribute_count=len(ATTRIBUTES), seed=0):
+    """Write 'count' instances as JSONL. Instance i uses seed + i, so corpora are reproducible."""
+    with open(path, "w") as f:
+        for i in range(count):
+            instance = generate_instance(house_count, attribute_count, seed + i)
+            f.write(json.dumps(instance) + "\n")
+
+
+def load_instances(path):
+    """Yield instances from a JSONL file, with clues converted back to Clue tuples."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                instance = json.loads(line)
+                instance["clues"] = [clue_from_json(c) for c in instance["clues"]]
+                yield instance
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate zebra puzzle instances as JSONL")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--houses", type=int, default=HOUSE_COUNT)
+    parser.add_argument("--attributes", type=int, default=len(ATTRIBUTES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="instances.jsonl")
+    args = parser.parse_args()
+
+    write_instances(args.out, args.count, args.houses, args.attributes, args.seed)
+    print(f"✅ Wrote {args.count} instances to '{args.out}'")
+
+
+if __name__ == "__main__":
+    main()
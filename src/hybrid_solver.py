@@ -1,14 +1,20 @@
 import random
-from mcts_solver import MCTSNode, generate_possible_moves, apply_move
+from mcts_solver import MCTSNode, generate_possible_moves, generate_mrv_moves, apply_move
 from csp_solver import complete_with_csp
 from state import ZebraState
 
 class HybridMCTSSolver:
-    def __init__(self, iterations=1000):
+    def __init__(self, iterations=1000, mrv_moves=False, backjumping=False):
         self.iterations = iterations
-
-    def search(self, initial_state):
-        root = MCTSNode(initial_state)
+        self.backjumping = backjumping    # Complete with CBJ + shared nogood cache
+        self.root = None
+        self.move_generator = generate_mrv_moves if mrv_moves else generate_possible_moves
+
+    def search(self, initial_state, root=None):
+        """Pass 'root' to resume or warm-start from a saved tree; the tree is kept in self.root."""
+        if root is None:
+            root = MCTSNode(initial_state)
+        self.root = root
         best_completed_state = None
 
         for _ in range(self.iterations):
@@ -22,6 +28,7 @@ class HybridMCTSSolver:
                 if reward > 0:
                     # Store completed state in the node
                     expanded_node.state = completed_state
+                    expanded_node.moves = None  # Cached moves belonged to the partial state
                     best_completed_state = completed_state
 
                 self.backpropagate(expanded_node, reward)
@@ -29,12 +36,12 @@ class HybridMCTSSolver:
         return best_completed_state or root.state
 
     def select(self, node):
-        while node.children and node.is_fully_expanded():
+        while node.children and node.is_fully_expanded(self.move_generator):
             node = node.best_child()
         return node
 
     def expand(self, node):
-        possible_moves = generate_possible_moves(node.state)
+        possible_moves = node.legal_moves(self.move_generator)
         tried_moves = [child.move for child in node.children]
         untried_moves = [m for m in possible_moves if m not in tried_moves]
 
@@ -61,7 +68,7 @@ class HybridMCTSSolver:
         partial_list = [dict(h) for h in partial_state.houses]
 
         # Call CSP solver
-        completed_list = complete_with_csp(partial_list)
+        completed_list = complete_with_csp(partial_list, backjumping=self.backjumping)
 
         # If CSP found solution, convert back to ZebraState
         if completed_list:
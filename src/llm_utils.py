@@ -10,10 +10,11 @@ gemini_failed_once = False
 # -------------------------------
 # Gemini API Query with Retry
 # -------------------------------
-def query_gemini_api(current_state, retries=2):
+def query_gemini_api(current_state, retries=2, usage=None):
     """
     Query Gemini API safely, enforcing JSON-only output.
     Retries up to 'retries' times if response is empty or invalid.
+    If a 'usage' dict is given, the tokens billed for every attempt are added to usage["tokens"].
     Returns: List of 5 dictionaries or None.
     """
     global gemini_failed_once
@@ -52,6 +53,9 @@ def query_gemini_api(current_state, retries=2):
         try:
             model = setup_gemini()
             response = model.generate_content(prompt, generation_config={"max_output_tokens": 512, "response_mime_type": "application/json"})
+            if usage is not None:
+                metadata = getattr(response, "usage_metadata", None)
+                usage["tokens"] = usage.get("tokens", 0) + (getattr(metadata, "total_token_count", 0) or 0)
             text = (response.text or "").strip()
 
             # ✅ Handle empty response
@@ -143,3 +147,86 @@ def query_gemini(current_state):
             return result
 
     return query_mock_llm(current_state)
+
+
+# -------------------------------
+# Budgeted LLM Calls
+# -------------------------------
+class LLMBudget:
+    """
+    Per-search budget deciding which rollouts are worth a Gemini call.
+
+    Caps: 'max_calls', 'max_tokens' and 'max_seconds' of API latency (None = no cap).
+    Within the caps, a call is made for:
+    - nodes visited at least 'min_visits' times whose reward variance is at
+      least 'min_variance' (their value is still uncertain), or
+    - states the heuristic rollout has failed on 'max_failures' times.
+    Calls are paced over the search: after a fraction p of the expected
+    rollouts at most p * max_calls + 1 calls can have been made, so early
+    nodes cannot drain the whole budget.
+
+    Each call records the reward of the LLM completion next to the reward of
+    the heuristic completion it replaced; report() sums up calls vs value gained.
+    """
+
+    def __init__(self, max_calls=20, max_tokens=None, max_seconds=None,
+                 min_visits=3, min_variance=0.01, max_failures=2):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.min_visits = min_visits
+        self.min_variance = min_variance
+        self.max_failures = max_failures
+        self.reset()
+
+    def reset(self, horizon=None):
+        """Start a new search of about 'horizon' rollouts (None = no pacing)."""
+        self.horizon = horizon
+        self.rollouts = 0
+        self.calls = 0
+        self.valid_calls = 0
+        self.tokens = 0
+        self.seconds = 0.0
+        self.gain = 0.0
+        self.failures = {}                # state key -> failed heuristic rollouts
+
+    def exhausted(self):
+        return ((self.max_calls is not None and self.calls >= self.max_calls)
+                or (self.max_tokens is not None and self.tokens >= self.max_tokens)
+                or (self.max_seconds is not None and self.seconds >= self.max_seconds))
+
+    def should_call(self, key, visits=0, variance=0.0):
+        """Count one rollout from the state with 'key' and decide whether it uses the LLM."""
+        self.rollouts += 1
+        if self.exhausted():
+            return False
+        if self.horizon and self.max_calls is not None:
+            if self.calls >= self.max_calls * self.rollouts / self.horizon + 1:
+                return False
+        uncertain = visits >= self.min_visits and variance >= self.min_variance
+        stuck = self.failures.get(key, 0) >= self.max_failures
+        return uncertain or stuck
+
+    def record_failure(self, key):
+        """The heuristic rollout from this state did not reach a valid solution."""
+        self.failures[key] = self.failures.get(key, 0) + 1
+
+    def record_call(self, key, reward, baseline, tokens=0, seconds=0.0, valid=True):
+        """Account for one LLM call and the reward it gained over the heuristic 'baseline'."""
+        self.calls += 1
+        self.valid_calls += int(valid)
+        self.tokens += tokens
+        self.seconds += seconds
+        self.gain += reward - baseline
+        self.failures.pop(key, None)      # Needs fresh failures before it is retried
+
+    def report(self):
+        return {
+            "rollouts": self.rollouts,
+            "calls": self.calls,
+            "valid_calls": self.valid_calls,
+            "tokens": self.tokens,
+            "seconds": self.seconds,
+            "value_gained": self.gain,
+            "value_per_call": self.gain / self.calls if self.calls else 0.0,
+        }
@@ -2,9 +2,12 @@ import random
 import copy
 import time
 import math
-from config import COLORS, NATIONALITIES, DRINKS, PETS, HOBBIES, HOUSE_COUNT
+from config import HOUSE_COUNT, ATTRIBUTES
 from state import ZebraState
-from llm_utils import query_gemini
+from clues import ZEBRA_CLUES, clue_holds
+from llm_utils import query_gemini, query_gemini_api, query_mock_llm
+from csp_solver import init_domains, prune_domains, select_unassigned_variable, is_valid_partial
+from mcts_tree import ArrayTree, rave_beta, reward_variance
 
 # -------------------------------
 # Node Class for MCTS
@@ -17,21 +20,58 @@ class MCTSNode:
         self.move = move                  # Move leading to this state
         self.visits = 0                   # Times this node was visited
         self.reward = 0                   # Accumulated reward
+        self.reward_sq = 0                # Accumulated squared reward (for the reward variance)
+        self.amaf_visits = 0              # Rollouts (anywhere in the tree) containing this move
+        self.amaf_reward = 0              # Accumulated reward of those rollouts
+        self.best_state = None            # Best completed rollout started at or below this node
+        self.best_score = -1              # Its solution_score()
+        self.moves = None                 # Cached legal moves from this state (see legal_moves)
 
-    def is_fully_expanded(self):
+    def legal_moves(self, move_generator=None):
+        """Moves from this state, generated once (MRV lookahead is costly) and cached."""
+        if self.moves is None:
+            self.moves = (move_generator or generate_possible_moves)(self.state)
+        return self.moves
+
+    def is_fully_expanded(self, move_generator=None):
         """Check if all possible moves have been tried."""
-        return len(self.children) == len(generate_possible_moves(self.state))
+        return len(self.children) == len(self.legal_moves(move_generator))
 
-    def best_child(self, c_param=1.4):
-        """Use UCT (Upper Confidence Bound) to select the best child."""
+    def best_child(self, c_param=1.4, rave_k=None):
+        """
+        Use UCT (Upper Confidence Bound) to select the best child.
+        With 'rave_k' set, the exploitation term blends in AMAF statistics (RAVE).
+        """
         choices = []
         for child in self.children:
-            uct = (child.reward / (child.visits + 1e-6)) + c_param * math.sqrt(
+            value = child.reward / (child.visits + 1e-6)
+            if rave_k is not None:
+                beta = rave_beta(child.visits, rave_k)
+                value = (1 - beta) * value + beta * child.amaf_reward / (child.amaf_visits + 1e-6)
+            uct = value + c_param * math.sqrt(
                 math.log(self.visits + 1) / (child.visits + 1e-6)
             )
             choices.append((uct, child))
         return max(choices, key=lambda x: x[0])[1]
 
+def solution_score(state, reward):
+    """Rank completed rollouts: reward first, then how many slots are filled."""
+    filled = sum(len(house) for house in state.houses)
+    return reward + (filled / (HOUSE_COUNT * 5)) * 0.5
+
+
+def completion_reward(state):
+    """
+    Reward of a completed rollout in budgeted search, for heuristic and LLM
+    completions alike: 1.0 for a valid solution, otherwise the fraction of
+    ZEBRA_CLUES that hold, scaled to stay below 1.
+    """
+    complete = all(len(house) == len(ATTRIBUTES) for house in state.houses)
+    if complete and state.is_valid():
+        return 1.0
+    held = sum(clue_holds(clue, state.houses) for clue in ZEBRA_CLUES)
+    return held / (len(ZEBRA_CLUES) + 1)
+
 # -------------------------------
 # Generate Possible Moves
 # -------------------------------
@@ -41,16 +81,9 @@ def generate_possible_moves(state: ZebraState):
     Each move is a tuple: (house_index, attribute_type, value)
     """
     moves = []
-    attributes = {
-        "color": COLORS,
-        "nationality": NATIONALITIES,
-        "drink": DRINKS,
-        "pet": PETS,
-        "hobby": HOBBIES
-    }
 
     for i in range(HOUSE_COUNT):
-        for attr, values in attributes.items():
+        for attr, values in ATTRIBUTES.items():
             if attr not in state.houses[i]:
                 for val in values:
                     # Avoid duplicate usage
@@ -59,43 +92,127 @@ def generate_possible_moves(state: ZebraState):
                 return moves  # Expand one attribute at a time
     return moves
 
+def generate_mrv_moves(state: ZebraState):
+    """
+    Generate moves for the most constrained empty slot (MRV).
+    Domains come from the CSP engine and are pruned by clue lookahead, so only
+    values consistent with the clues are offered. Returns [] for dead ends.
+    """
+    solution = [dict(h) for h in state.houses]
+    if not is_valid_partial(solution):
+        return []
+
+    domains = init_domains(solution)
+    if not prune_domains(solution, domains):
+        return []
+
+    var = select_unassigned_variable(solution, domains)
+    if var is None:
+        return []
+    house_index, attr = var
+    return [(house_index, attr, val) for val in ATTRIBUTES[attr] if val in domains[house_index][attr]]
+
 # -------------------------------
 # Apply a Move
 # -------------------------------
 def apply_move(state: ZebraState, move):
     new_state = state.clone()
     house_index, attr, value = move
-    new_state.houses[house_index][attr] = value
+    new_state.assign(house_index, attr, value)
     return new_state
 
 # -------------------------------
 # MCTS Solver
 # -------------------------------
 class MCTSSolver:
-    def __init__(self, iterations=1000):
+    def __init__(self, iterations=1000, array_tree=False, rave=False, rave_k=500, rollout_policy=None,
+                 mrv_moves=False, llm_budget=None):
         self.iterations = iterations
+        self.root = None                  # Tree of the last search (MCTSNode storage)
+        self.move_index = {}              # move -> MCTSNode list, for AMAF updates across the tree
+        self.tree = None                  # Tree of the last search (ArrayTree storage)
+        self.array_tree = array_tree      # Use the NumPy-backed ArrayTree instead of MCTSNode objects
+        self.rave = rave                  # Share rollout results across matching moves (RAVE / AMAF)
+        self.rave_k = rave_k              # Equivalence parameter: visits at which UCT and AMAF weigh equally-ish
+        self.rollout_policy = rollout_policy  # Callable state -> (completed_state, reward); None = LLM path
+        self.move_generator = generate_mrv_moves if mrv_moves else generate_possible_moves  # MRV + clue-filtered expansion
+        self.llm_budget = llm_budget      # LLMBudget deciding which rollouts call Gemini; None = 5% sampling
+
+    def search(self, initial_state, root=None):
+        """
+        Run MCTS from 'initial_state'. Pass 'root' (e.g. from snapshot.load_tree or
+        snapshot.reroot; an ArrayTree from load_array_tree or reroot_array when
+        array_tree=True) to resume or warm-start from an existing tree.
+        The tree is kept in self.root / self.tree for saving.
+        """
+        if self.array_tree:
+            return self.search_array(initial_state, tree=root)
 
-    def search(self, initial_state):
-        root = MCTSNode(initial_state)
+        if root is None:
+            root = MCTSNode(initial_state)
+        self.root = root
+        self.move_index = self.index_moves(root)
+        if self.llm_budget is not None:
+            self.llm_budget.reset(horizon=self.iterations)
 
         for _ in range(self.iterations):
             node = self.select(root)
             expanded_node = self.expand(node)
-            reward, completed_state = self.simulate(expanded_node.state)
-            expanded_node.state = completed_state  # Update state with simulation result
+            stats = self.node_stats(node) if self.llm_budget is not None else None
+            reward, completed_state = self.simulate(expanded_node.state, stats)
             self.backpropagate(expanded_node, reward)
+            self.record_rollout(expanded_node, completed_state, reward)
+            if self.rave:
+                self.update_amaf(completed_state, reward)
 
         return self.get_best_solution(root)
 
+    def search_array(self, initial_state, tree=None):
+        """Same search as search(), but on an ArrayTree with vectorized UCT selection."""
+        if tree is None:
+            tree = ArrayTree(initial_state)
+        self.tree = tree
+        if self.llm_budget is not None:
+            self.llm_budget.reset(horizon=self.iterations)
+
+        for _ in range(self.iterations):
+            # Selection
+            node = 0
+            while tree.is_fully_expanded(node):
+                node = tree.best_child(node, rave_k=self.rave_k if self.rave else None)
+
+            # Expansion
+            stats = None
+            if self.llm_budget is not None:
+                stats = (tree.states[node].key(), tree.visits[node],
+                         reward_variance(tree.visits[node], tree.rewards[node], tree.rewards_sq[node]))
+            if not tree.is_expanded(node):
+                tree.add_children(node, self.move_generator(tree.states[node]))
+            untried = tree.untried_children(node)
+            if len(untried):
+                child = int(random.choice(untried))
+                tree.states[child] = apply_move(tree.states[node], tree.move(child))
+                node = child
+
+            # Simulation + backpropagation
+            reward, completed_state = self.simulate(tree.states[node], stats)
+            tree.backpropagate(node, reward)
+            tree.record_rollout(node, completed_state, solution_score(completed_state, reward))
+            if self.rave:
+                tree.update_amaf(completed_state, reward)
+
+        return self.get_best_array_solution(tree)
+
     def select(self, node):
         """Select a leaf node using UCT."""
-        while node.children and node.is_fully_expanded():
-            node = node.best_child()
+        rave_k = self.rave_k if self.rave else None
+        while node.children and node.is_fully_expanded(self.move_generator):
+            node = node.best_child(rave_k=rave_k)
         return node
 
     def expand(self, node):
         """Expand tree by adding a new child node from unexplored moves."""
-        possible_moves = generate_possible_moves(node.state)
+        possible_moves = node.legal_moves(self.move_generator)
         tried_moves = [child.move for child in node.children]
         untried_moves = [m for m in possible_moves if m not in tried_moves]
 
@@ -106,27 +223,86 @@ class MCTSSolver:
         new_state = apply_move(node.state, move)
         child_node = MCTSNode(new_state, parent=node, move=move)
         node.children.append(child_node)
+        self.move_index.setdefault(move, []).append(child_node)
         return child_node
 
-    def simulate(self, state):
+    def node_stats(self, node):
+        """(state key, visits, reward variance) of a node, as used by the LLM budget."""
+        return node.state.key(), node.visits, reward_variance(node.visits, node.reward, node.reward_sq)
+
+    def simulate(self, state, node_stats=None):
         """
         Simulate a complete solution using Gemini mock and fallback logic.
         Reward based on how many constraints are satisfied.
+        A configured rollout_policy replaces the LLM completion entirely,
+        unless an llm_budget is set (see simulate_budgeted).
+        'node_stats' describes the node selected for expansion (see node_stats()).
         """
-        temp_state = state.clone()
+        if self.llm_budget is not None:
+            return self.simulate_budgeted(state, node_stats or self.node_stats(MCTSNode(state)))
 
-        # Ask Gemini to suggest completions for the remaining slots
-        suggestion = query_gemini(temp_state.houses)
+        if self.rollout_policy is not None:
+            completed_state, reward = self.rollout_policy(state)
+            return reward, completed_state
 
-        # Apply Gemini's suggestion
-        for i, attrs in enumerate(suggestion):
-            for k, v in attrs.items():
-                temp_state.houses[i][k] = v
+        # Ask Gemini to suggest completions for the remaining slots
+        suggestion = query_gemini(state.houses)
+        temp_state = self.apply_suggestion(state, suggestion)
 
         # Compute partial reward
         reward = self.evaluate_state(temp_state)
         return reward, temp_state
 
+    def simulate_budgeted(self, state, node_stats):
+        """
+        Heuristic rollout (rollout_policy, or the mock LLM) unless the budget
+        picks this rollout for a Gemini call, based on the statistics of the
+        node selected for expansion (a fresh leaf has none). Budgeted calls
+        also run the heuristic once, so the budget can record what they gained.
+        Both paths are scored with completion_reward, so node statistics and
+        variances mix only one reward scale, on which a valid solution scores 1.
+        Complete states have nothing left to ask for and never use the budget.
+        """
+        budget = self.llm_budget
+        key, visits, variance = node_stats
+        filled = all(len(house) == len(ATTRIBUTES) for house in state.houses)
+        if filled or not budget.should_call(key, visits, variance):
+            reward, completed_state = self.heuristic_rollout(state)
+            if reward < 1:  # Not a valid solution
+                budget.record_failure(key)
+            return reward, completed_state
+
+        usage = {}
+        start = time.time()
+        suggestion = query_gemini_api(state.houses, retries=2, usage=usage)
+        seconds = time.time() - start
+
+        baseline, baseline_state = self.heuristic_rollout(state)
+        if not suggestion:
+            budget.record_call(key, baseline, baseline, usage.get("tokens", 0), seconds, valid=False)
+            return baseline, baseline_state
+
+        completed_state = self.apply_suggestion(state, suggestion)
+        reward = completion_reward(completed_state)
+        budget.record_call(key, reward, baseline, usage.get("tokens", 0), seconds)
+        return reward, completed_state
+
+    def heuristic_rollout(self, state):
+        """(reward, completed_state) from the rollout_policy, or from the mock LLM, scored with completion_reward."""
+        if self.rollout_policy is not None:
+            completed_state, _ = self.rollout_policy(state)
+        else:
+            completed_state = self.apply_suggestion(state, query_mock_llm(state.houses))
+        return completion_reward(completed_state), completed_state
+
+    def apply_suggestion(self, state, suggestion):
+        """Copy of 'state' with every value of the (LLM) suggestion assigned."""
+        temp_state = state.clone()
+        for i, attrs in enumerate(suggestion):
+            for k, v in attrs.items():
+                temp_state.assign(i, k, v)
+        return temp_state
+
     def evaluate_state(self, state):
         """
         Reward system for Zebra puzzle:
@@ -179,18 +355,43 @@ class MCTSSolver:
         while node:
             node.visits += 1
             node.reward += reward
+            node.reward_sq += reward * reward
+            node = node.parent
+
+    def record_rollout(self, node, completed_state, reward):
+        """Keep the completed rollout as best_state of every node on the path where it scores best."""
+        score = solution_score(completed_state, reward)
+        while node and score > node.best_score:
+            node.best_score = score
+            node.best_state = completed_state
             node = node.parent
 
+    def index_moves(self, root):
+        """Map every move in the tree to the nodes it leads to."""
+        index = {}
+        stack = list(root.children)
+        while stack:
+            node = stack.pop()
+            index.setdefault(node.move, []).append(node)
+            stack.extend(node.children)
+        return index
+
+    def update_amaf(self, completed_state, reward):
+        """
+        All-moves-as-first update: credit every node in the tree whose move
+        appears anywhere in the completed rollout state. Siblings all fill the
+        same slot, so the credit comes from rollouts through other branches.
+        """
+        for house_index, house in enumerate(completed_state.houses):
+            for attr, value in house.items():
+                for node in self.move_index.get((house_index, attr, value), ()):
+                    node.amaf_visits += 1
+                    node.amaf_reward += reward
+
     def get_best_solution(self, root):
         """Return the most filled solution with best reward score."""
-        best_child = None
-        best_score = -1
-
-        for child in root.children:
-            filled = sum(len(house) for house in child.state.houses)
-            score = (child.reward / (child.visits + 1e-6)) + (filled / (HOUSE_COUNT * 5)) * 0.5
-            if score > best_score:
-                best_score = score
-                best_child = child
+        return root.best_state
 
-        return best_child.state if best_child else None
+    def get_best_array_solution(self, tree):
+        """ArrayTree counterpart of get_best_solution."""
+        return tree.best_states[0]
@@ -0,0 +1,264 @@
+import math
+import numpy as np
+from config import ATTRIBUTES
+from state import ZebraState
+
+ATTR_NAMES = list(ATTRIBUTES)
+
+# -------------------------------
+# Move / State Encoding
+# -------------------------------
+def encode_move(move):
+    """Turn (house_index, attribute_type, value) into three small ints."""
+    house_index, attr, value = move
+    return house_index, ATTR_NAMES.index(attr), ATTRIBUTES[attr].index(value)
+
+
+def decode_move(house_index, attr_index, value_index):
+    """Inverse of encode_move."""
+    attr = ATTR_NAMES[attr_index]
+    return int(house_index), attr, ATTRIBUTES[attr][value_index]
+
+
+def encode_state(state):
+    """ZebraState -> (houses x attributes) int8 grid of value indices, -1 = empty/unknown."""
+    grid = np.full((len(state.houses), len(ATTR_NAMES)), -1, dtype=np.int8)
+    for h, house in enumerate(state.houses):
+        for a, attr in enumerate(ATTR_NAMES):
+            value = house.get(attr)
+            if value in ATTRIBUTES[attr]:
+                grid[h, a] = ATTRIBUTES[attr].index(value)
+    return grid
+
+
+def decode_state(grid):
+    """Inverse of encode_state."""
+    houses = [dict() for _ in range(len(grid))]
+    for h, row in enumerate(grid):
+        for a, value_index in enumerate(row):
+            if value_index >= 0:
+                attr = ATTR_NAMES[a]
+                houses[h][attr] = ATTRIBUTES[attr][value_index]
+    return ZebraState(houses)
+
+# -------------------------------
+# RAVE Schedule
+# -------------------------------
+def rave_beta(visits, rave_k):
+    """
+    Weight of the AMAF estimate in the RAVE blend (Gelly & Silver schedule).
+    Close to 1 for unvisited nodes, decays towards 0 once 'visits' >> 'rave_k'.
+    Works on scalars and NumPy arrays alike.
+    """
+    return np.sqrt(rave_k / (3 * visits + rave_k))
+
+
+def reward_variance(visits, reward, reward_sq):
+    """Variance of the rollout rewards seen at a node (0 until it has two visits)."""
+    if visits < 2:
+        return 0.0
+    mean = reward / visits
+    return max(0.0, reward_sq / visits - mean * mean)
+
+# -------------------------------
+# Array-backed MCTS Tree
+# -------------------------------
+class ArrayTree:
+    """
+    MCTS tree stored as a struct of preallocated NumPy arrays.
+    Node 0 is the root. All children of a node are allocated together
+    in one contiguous block, so UCT over them reads a single slice.
+    Arrays double in size whenever they run out of room.
+
+    NumPy pays a fixed cost per call, which dominates on the 5-wide child
+    blocks of the standard puzzle, so blocks narrower than
+    VECTOR_MIN_CHILDREN are scored as Python floats and only wider ones
+    with one vector operation. Even so, per-element array access keeps
+    plain UCT on the standard puzzle about 25% slower than MCTSNode; the
+    array layout pays off in compact snapshots, the whole-tree AMAF update
+    and wide branching.
+    """
+
+    VECTOR_MIN_CHILDREN = 32
+
+    # field name -> (dtype, fill value)
+    FIELDS = {
+        "visits": (np.float64, 0),
+        "rewards": (np.float64, 0),
+        "rewards_sq": (np.float64, 0),
+        "amaf_visits": (np.float64, 0),
+        "amaf_rewards": (np.float64, 0),
+        "best_score": (np.float64, -1),
+        "parent": (np.int64, -1),
+        "child_offset": (np.int64, -1),
+        "child_count": (np.int64, 0),
+        "tried_count": (np.int64, 0),
+        "move_house": (np.int16, -1),
+        "move_attr": (np.int16, -1),
+        "move_value": (np.int16, -1),
+    }
+
+    def __init__(self, root_state, capacity=1024):
+        self.capacity = capacity
+        self.size = 1
+        for name, (dtype, fill) in self.FIELDS.items():
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+        self.states = [None] * capacity   # ZebraState per node, filled lazily
+        self.states[0] = root_state
+        self.best_states = [None] * capacity  # Best completed rollout at or below each node
+
+    def _grow(self, needed):
+        """Grow every array geometrically until it can hold 'needed' nodes."""
+        new_capacity = self.capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        if new_capacity == self.capacity:
+            return
+        for name, (dtype, fill) in self.FIELDS.items():
+            grown = np.full(new_capacity, fill, dtype=dtype)
+            grown[:self.capacity] = getattr(self, name)
+            setattr(self, name, grown)
+        self.states.extend([None] * (new_capacity - self.capacity))
+        self.best_states.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
+
+    def is_expanded(self, node):
+        """True once the child block of 'node' has been allocated."""
+        return self.child_offset[node] >= 0
+
+    def children(self, node):
+        """Indices of all children of 'node'."""
+        start = self.child_offset[node]
+        if start < 0:
+            return np.arange(0)
+        return np.arange(start, start + self.child_count[node])
+
+    def add_children(self, node, moves):
+        """Allocate one child per move in a contiguous block."""
+        start = self.size
+        end = start + len(moves)
+        self._grow(end)
+        for i, move in enumerate(moves):
+            h, a, v = encode_move(move)
+            self.move_house[start + i] = h
+            self.move_attr[start + i] = a
+            self.move_value[start + i] = v
+        self.parent[start:end] = node
+        self.child_offset[node] = start
+        self.child_count[node] = len(moves)
+        self.size = end
+        return start
+
+    def untried_children(self, node):
+        """Children that have never been visited."""
+        start = self.child_offset[node]
+        if start < 0:
+            return np.arange(0)
+        visits = self.visits[start:start + self.child_count[node]].tolist()
+        return [start + i for i, n in enumerate(visits) if n == 0]
+
+    def is_fully_expanded(self, node):
+        """Check if the node has children and all of them have been tried."""
+        count = self.child_count[node]
+        return count > 0 and self.tried_count[node] == count
+
+    def best_child(self, node, c_param=1.4, rave_k=None):
+        """
+        UCT over the child block of 'node', vectorized for wide blocks.
+        With 'rave_k' set, the exploitation term blends in AMAF statistics.
+        """
+        start = int(self.child_offset[node])
+        end = start + int(self.child_count[node])
+        if end - start >= self.VECTOR_MIN_CHILDREN:
+            return self._best_child_vector(node, start, end, c_param, rave_k)
+        log_parent = math.log(self.visits[node] + 1)
+        visits = self.visits[start:end].tolist()
+        rewards = self.rewards[start:end].tolist()
+        if rave_k is not None:
+            amaf_visits = self.amaf_visits[start:end].tolist()
+            amaf_rewards = self.amaf_rewards[start:end].tolist()
+        best, best_uct = start, -math.inf
+        for i, n in enumerate(visits):
+            value = rewards[i] / (n + 1e-6)
+            if rave_k is not None:
+                beta = math.sqrt(rave_k / (3 * n + rave_k))
+                amaf = amaf_rewards[i] / (amaf_visits[i] + 1e-6)
+                value = (1 - beta) * value + beta * amaf
+            uct = value + c_param * math.sqrt(log_parent / (n + 1e-6))
+            if uct > best_uct:
+                best, best_uct = start + i, uct
+        return best
+
+    def _best_child_vector(self, node, start, end, c_param, rave_k):
+        """best_child() as NumPy vector operations over the block."""
+        visits = self.visits[start:end] + 1e-6
+        value = self.rewards[start:end] / visits
+        if rave_k is not None:
+            beta = rave_beta(self.visits[start:end], rave_k)
+            amaf = self.amaf_rewards[start:end] / (self.amaf_visits[start:end] + 1e-6)
+            value = (1 - beta) * value + beta * amaf
+        uct = value + c_param * np.sqrt(np.log(self.visits[node] + 1) / visits)
+        return int(start + np.argmax(uct))
+
+    def subtree(self, node):
+        """
+        Copy the subtree below 'node' into a new, compact ArrayTree rooted at it,
+        keeping statistics, states and contiguous child blocks.
+        """
+        tree = ArrayTree(self.states[node])
+        for name in self.FIELDS:
+            getattr(tree, name)[0] = getattr(self, name)[node]
+        tree.parent[0] = -1
+        tree.move_house[0] = tree.move_attr[0] = tree.move_value[0] = -1
+        tree.best_states[0] = self.best_states[node]
+
+        queue = [(node, 0)]
+        for old, new in queue:  # Breadth-first; 'queue' grows while iterating
+            start = self.child_offset[old]
+            if start < 0:
+                continue
+            count = self.child_count[old]
+            first = tree.size
+            tree._grow(first + count)
+            for name in self.FIELDS:
+                getattr(tree, name)[first:first + count] = getattr(self, name)[start:start + count]
+            tree.states[first:first + count] = self.states[start:start + count]
+            tree.best_states[first:first + count] = self.best_states[start:start + count]
+            tree.parent[first:first + count] = new
+            tree.child_offset[new] = first
+            tree.size = first + count
+            queue.extend((start + i, first + i) for i in range(count))
+        return tree
+
+    def move(self, node):
+        """Move leading to 'node' as a (house_index, attribute_type, value) tuple."""
+        return decode_move(self.move_house[node], self.move_attr[node], self.move_value[node])
+
+    def update_amaf(self, completed_state, reward):
+        """
+        All-moves-as-first update: credit every node in the tree whose move
+        appears anywhere in the completed rollout state (one vector comparison).
+        """
+        values = encode_state(completed_state)
+        houses = self.move_house[1:self.size]
+        attrs = self.move_attr[1:self.size]
+        match = 1 + np.flatnonzero(values[houses, attrs] == self.move_value[1:self.size])
+        self.amaf_visits[match] += 1
+        self.amaf_rewards[match] += reward
+
+    def record_rollout(self, node, completed_state, score):
+        """Keep the completed rollout as best state of every node on the path where it scores best."""
+        while node >= 0 and score > self.best_score[node]:
+            self.best_score[node] = score
+            self.best_states[node] = completed_state
+            node = self.parent[node]
+
+    def backpropagate(self, node, reward):
+        """Propagate a simulation result from 'node' up to the root."""
+        if self.visits[node] == 0 and self.parent[node] >= 0:
+            self.tried_count[self.parent[node]] += 1
+        while node >= 0:
+            self.visits[node] += 1
+            self.rewards[node] += reward
+            self.rewards_sq[node] += reward * reward
+            node = self.parent[node]
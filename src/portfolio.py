@@ -0,0 +1,207 @@
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from config import ATTRIBUTES
+from state import ZebraState
+from csp_solver import complete_with_csp
+from dlx_solver import solve_dlx
+from hybrid_solver import HybridMCTSSolver
+from mcts_solver import MCTSSolver
+
+# -------------------------------
+# Engines
+# -------------------------------
+def run_csp(state):
+    houses = complete_with_csp(state.houses)
+    return ZebraState(houses) if houses else None
+
+
+def run_dlx(state):
+    houses = solve_dlx(state.houses)
+    return ZebraState(houses) if houses else None
+
+
+def run_hybrid(state):
+    return HybridMCTSSolver(iterations=50).search(state)
+
+
+def run_mcts(state):
+    return MCTSSolver(iterations=50).search(state)
+
+
+# Engine name -> callable(ZebraState) -> ZebraState or None
+ENGINES = {
+    "csp": run_csp,
+    "dlx": run_dlx,
+    "hybrid": run_hybrid,
+    "mcts": run_mcts,
+}
+
+
+def is_solution(state):
+    """A portfolio answer must be complete and satisfy every clue."""
+    return (state is not None
+            and all(len(house) == len(ATTRIBUTES) for house in state.houses)
+            and state.is_valid())
+
+
+def instance_shape(state):
+    """Coarse key used to learn which engine wins on which kind of instance."""
+    return len(state.houses), sum(len(house) for house in state.houses)
+
+
+# Races are started from service worker threads. A plain fork would copy
+# locks other threads hold at that moment, so workers start fresh instead.
+_PROCESSES = multiprocessing.get_context("spawn")
+
+
+def _process_worker(name, houses, results):
+    """Run one engine in a worker process and report (name, houses or None, seconds)."""
+    start = time.time()
+    try:
+        solution = ENGINES[name](ZebraState([dict(h) for h in houses]))
+        houses = solution.houses if is_solution(solution) else None
+    except Exception:
+        houses = None
+    results.put((name, houses, time.time() - start))
+
+# -------------------------------
+# Portfolio Solver
+# -------------------------------
+class PortfolioSolver:
+    """
+    Races several engines on the same instance and keeps the first valid answer.
+
+    Engines run in worker processes (losers are terminated) or, with
+    use_processes=False, in threads (losers are abandoned and finish in the
+    background). Each race is recorded per instance shape; once at least
+    'min_races' races were run for a shape and one engine has won at least
+    'confidence' of all of them, it is run alone without racing. If it fails
+    or raises, the portfolio falls back to a race. The learned statistics
+    are guarded by a lock, so one portfolio can serve several threads.
+    """
+
+    def __init__(self, engines=("csp", "dlx", "hybrid"), timeout=None, use_processes=True,
+                 min_races=5, confidence=0.8):
+        self.engines = list(engines)
+        self.timeout = timeout
+        self.use_processes = use_processes
+        self.min_races = min_races
+        self.confidence = confidence
+        self.stats = {}            # shape -> engine -> {"wins": int, "time": float}
+        self.races = {}            # shape -> number of races run
+        self.last_winner = None
+        self.lock = threading.Lock()
+
+    def solve(self, state=None, timeout=None):
+        """Return the first valid ZebraState found, or None. 'timeout' overrides self.timeout for the race."""
+        state = state or ZebraState()
+        shape = instance_shape(state)
+        timeout = self.timeout if timeout is None else timeout
+
+        with self.lock:
+            engine = self.pick_engine(shape)
+        if engine is not None:
+            start = time.time()
+            try:
+                solution = ENGINES[engine](state.clone())
+            except Exception:
+                solution = None
+            if is_solution(solution):
+                with self.lock:
+                    self.record(shape, engine, time.time() - start, raced=False)
+                return solution
+
+        if self.use_processes:
+            solution, winner, elapsed = self.race_processes(state, timeout)
+        else:
+            solution, winner, elapsed = self.race_threads(state, timeout)
+
+        with self.lock:
+            self.races[shape] = self.races.get(shape, 0) + 1
+            if winner is not None:
+                self.record(shape, winner, elapsed, raced=True)
+            else:
+                self.last_winner = None
+        return solution
+
+    def pick_engine(self, shape):
+        """Engine to run without racing, or None if the priors are not confident yet."""
+        races = self.races.get(shape, 0)
+        if races < self.min_races:
+            return None
+        stats = self.stats.get(shape, {})
+        engine = max(stats, key=lambda name: stats[name]["wins"], default=None)
+        if engine is None or stats[engine]["wins"] < self.confidence * races:
+            return None
+        return engine
+
+    def record(self, shape, engine, elapsed, raced):
+        entry = self.stats.setdefault(shape, {}).setdefault(engine, {"wins": 0, "time": 0.0})
+        if raced:
+            entry["wins"] += 1
+        entry["time"] += elapsed
+        self.last_winner = engine
+
+    def race_processes(self, state, timeout=None):
+        results = _PROCESSES.Queue()
+        workers = [_PROCESSES.Process(target=_process_worker, args=(name, state.houses, results), daemon=True)
+                   for name in self.engines]
+        for worker in workers:
+            worker.start()
+
+        deadline = time.time() + timeout if timeout is not None else None
+        solution, winner, elapsed = None, None, None
+        pending = len(workers)
+        try:
+            while pending:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                try:
+                    name, houses, seconds = results.get(timeout=0.05)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers) and results.empty():
+                        break  # A worker died without reporting
+                    continue
+                pending -= 1
+                if houses is not None:
+                    solution, winner, elapsed = ZebraState(houses), name, seconds
+                    break
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+        return solution, winner, elapsed
+
+    def race_threads(self, state, timeout=None):
+        def run(name):
+            start = time.time()
+            return name, ENGINES[name](state.clone()), time.time() - start
+
+        executor = ThreadPoolExecutor(max_workers=len(self.engines))
+        futures = [executor.submit(run, name) for name in self.engines]
+        solution, winner, elapsed = None, None, None
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                try:
+                    name, result, seconds = future.result()
+                except Exception:
+                    continue
+                if is_solution(result):
+                    solution, winner, elapsed = result, name, seconds
+                    break
+        except FuturesTimeout:
+            pass
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return solution, winner, elapsed
+
+
+def solve_portfolio(state=None, engines=("csp", "dlx", "hybrid"), timeout=None, use_processes=True):
+    """One-off race. Returns (solution, winning engine name)."""
+    solver = PortfolioSolver(engines, timeout=timeout, use_processes=use_processes)
+    solution = solver.solve(state)
+    return solution, solver.last_winner
@@ -0,0 +1,265 @@
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from state import ZebraState
+from csp_solver import complete_with_csp
+from portfolio import ENGINES, PortfolioSolver, is_solution
+
+# ================================
+# LONG-RUNNING SOLVER SERVICE
+# ================================
+#
+# Keeps solvers, their caches (CBJ nogoods, portfolio priors, Gemini
+# client) and a result cache resident between requests. Requests go through
+# a bounded queue served by a fixed pool of worker threads.
+#
+# Single engines can't be interrupted: a job that overruns its deadline
+# keeps its worker until the engine returns, and is then counted as expired
+# (its result is dropped). Portfolio races get the remaining time as their
+# timeout and run in processes, so losing engines are terminated.
+#
+#   POST /solve  {"state": [5 house dicts], "solver": "csp", "deadline": 5.0}
+#   GET  /stats
+
+def run_csp_backjumping(state):
+    """CSP with backjumping, so learned nogoods stay warm across requests."""
+    houses = complete_with_csp(state.houses, backjumping=True)
+    return ZebraState(houses) if houses else None
+
+
+def parse_state(houses):
+    """ZebraState from the request's house dicts; only string values are accepted."""
+    if not houses:
+        return None
+    houses = [dict(h) for h in houses]
+    for house in houses:
+        for attr, value in house.items():
+            if not isinstance(value, str):
+                raise ValueError(f"value of {attr!r} must be a string")
+    return ZebraState(houses)
+
+
+class SolveJob:
+    def __init__(self, solver, state, deadline):
+        self.solver = solver
+        self.state = state
+        self.deadline = deadline          # Absolute time.time() value
+        self.done = threading.Event()
+        self.solution = None
+        self.error = None
+        self.cached = False
+        self.seconds = 0.0
+
+
+class SolverService:
+    def __init__(self, workers=4, queue_size=64, cache_size=1024, default_solver="csp", default_deadline=30.0):
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.cache = OrderedDict()        # (solver, state.key()) -> solved houses, LRU order
+        self.cache_size = cache_size
+        self.default_solver = default_solver
+        self.default_deadline = default_deadline
+        self.lock = threading.Lock()
+        self.portfolio = PortfolioSolver()  # Shared priors; losers run in processes and are terminated
+        self.solvers = dict(ENGINES)
+        self.solvers["csp"] = run_csp_backjumping
+        self.solvers["portfolio"] = self.portfolio.solve
+        self.started = time.time()
+        self.counters = {"requests": 0, "completed": 0, "failed": 0, "rejected": 0,
+                         "expired": 0, "cache_hits": 0}
+        self.solver_stats = {}            # solver -> {"count": int, "seconds": float}
+
+        self.workers = [threading.Thread(target=self.work, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def warmup(self):
+        """Solve the empty puzzle once with the cheap engines to fill caches."""
+        for solver in ("dlx", "csp"):
+            self.solve(solver=solver)
+
+    def submit(self, solver=None, state=None, deadline=None):
+        """Queue a solve request. Raises queue.Full when the service is saturated."""
+        solver = solver or self.default_solver
+        if solver not in self.solvers:
+            raise KeyError(solver)
+        deadline = time.time() + (deadline if deadline is not None else self.default_deadline)
+        job = SolveJob(solver, state or ZebraState(), deadline)
+        self.count("requests")
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            self.count("rejected")
+            raise
+        return job
+
+    def solve(self, solver=None, state=None, deadline=None):
+        """Submit and wait until the job finishes or its deadline passes."""
+        job = self.submit(solver, state, deadline)
+        if not job.done.wait(timeout=max(0.0, job.deadline - time.time())):
+            job.error = "deadline exceeded"
+        return job
+
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                self.run(job)
+            except Exception as e:  # Keep the worker alive whatever the job does
+                job.error = str(e)
+                self.count("failed")
+            finally:
+                job.done.set()
+                self.jobs.task_done()
+
+    def run(self, job):
+        if time.time() >= job.deadline:
+            job.error = "deadline exceeded"
+            self.count("expired")
+            return
+
+        key = (job.solver, job.state.key())
+        with self.lock:
+            houses = self.cache.get(key)
+            if houses is not None:
+                self.cache.move_to_end(key)
+                self.counters["cache_hits"] += 1
+        if houses is not None:
+            job.solution = ZebraState([dict(h) for h in houses])
+            job.cached = True
+            self.count("completed")
+            return
+
+        start = time.time()
+        try:
+            if job.solver == "portfolio":
+                solution = self.portfolio.solve(job.state.clone(), timeout=job.deadline - start)
+            else:
+                solution = self.solvers[job.solver](job.state.clone())
+        except Exception as e:
+            job.error = str(e)
+            self.count("failed")
+            return
+        job.seconds = time.time() - start
+
+        with self.lock:
+            entry = self.solver_stats.setdefault(job.solver, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += job.seconds
+            if time.time() > job.deadline:
+                job.error = "deadline exceeded"
+                self.counters["expired"] += 1
+                return
+            self.counters["completed"] += 1
+            if is_solution(solution):
+                self.cache[key] = [dict(h) for h in solution.houses]
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        job.solution = solution
+
+    def stats(self):
+        with self.lock:
+            return {
+                "uptime": time.time() - self.started,
+                "workers": len(self.workers),
+                "queue_depth": self.jobs.qsize(),
+                "queue_size": self.jobs.maxsize,
+                "cache_entries": len(self.cache),
+                **self.counters,
+                "solvers": {name: dict(entry) for name, entry in self.solver_stats.items()},
+                "portfolio_last_winner": self.portfolio.last_winner,
+            }
+
+# -------------------------------
+# HTTP Front End
+# -------------------------------
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self.send_json(200, service.stats())
+            else:
+                self.send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/solve":
+                self.send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                state = parse_state(request.get("state"))
+                job = service.solve(request.get("solver"), state, request.get("deadline"))
+            except queue.Full:
+                self.send_json(503, {"error": "queue full"})
+                return
+            except KeyError as e:
+                self.send_json(400, {"error": f"unknown solver {e}"})
+                return
+            except (ValueError, TypeError, AttributeError) as e:
+                self.send_json(400, {"error": f"bad request: {e}"})
+                return
+
+            if job.error == "deadline exceeded":
+                self.send_json(504, {"error": job.error})
+            elif job.error:
+                self.send_json(500, {"error": job.error})
+            else:
+                solution = job.solution
+                self.send_json(200, {
+                    "solver": job.solver,
+                    "solution": solution.houses if solution else None,
+                    "valid": is_solution(solution),
+                    "cached": job.cached,
+                    "seconds": job.seconds,
+                })
+
+        def log_message(self, format, *args):
+            pass  # Keep the console quiet under load
+
+    return Handler
+
+
+def serve(service, host="127.0.0.1", port=8765):
+    """Create (but don't start) the HTTP server; call serve_forever() on it."""
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zebra puzzle solver service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--solver", default="csp", help="default solver: " + ", ".join(list(ENGINES) + ["portfolio"]))
+    args = parser.parse_args()
+
+    service = SolverService(workers=args.workers, queue_size=args.queue_size, default_solver=args.solver)
+    service.warmup()
+    server = serve(service, args.host, args.port)
+    print(f"🚀 Solver service listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
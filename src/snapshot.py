@@ -0,0 +1,163 @@
+import numpy as np
+from config import HOUSE_COUNT
+from mcts_solver import MCTSNode
+from mcts_tree import ArrayTree, ATTR_NAMES, encode_move, decode_move, encode_state, decode_state
+
+# ================================
+# MCTS TREE SNAPSHOTS
+# ================================
+#
+# Trees are flattened into NumPy arrays and written with np.savez_compressed:
+# per-node statistics, the move leading to each node as three small ints,
+# and each node's state (plus the best completed rollout below it) as a
+# (houses x attributes) int8 grid of value indices (-1 = empty). Values
+# outside config.py (e.g. malformed LLM output) are not representable and
+# load back as empty slots.
+
+def encode_optional_states(states):
+    """(has_state mask, stacked grids) for a list of ZebraStates that may contain None."""
+    empty = np.full((HOUSE_COUNT, len(ATTR_NAMES)), -1, dtype=np.int8)
+    has_state = np.array([s is not None for s in states])
+    grids = np.stack([encode_state(s) if s is not None else empty for s in states])
+    return has_state, grids
+
+# -------------------------------
+# MCTSNode trees
+# -------------------------------
+def save_tree(root, path):
+    """Write an MCTSNode tree (moves, statistics and states) to 'path'."""
+    nodes = [root]
+    parents = [-1]
+    for index, node in enumerate(nodes):  # Breadth-first; 'nodes' grows while iterating
+        for child in node.children:
+            nodes.append(child)
+            parents.append(index)
+
+    moves = np.array([encode_move(n.move) if n.move else (-1, -1, -1) for n in nodes],
+                     dtype=np.int16).reshape(-1, 3)
+    has_best, best_states = encode_optional_states([n.best_state for n in nodes])
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            parent=np.array(parents, dtype=np.int64),
+            visits=np.array([n.visits for n in nodes], dtype=np.float64),
+            reward=np.array([n.reward for n in nodes], dtype=np.float64),
+            reward_sq=np.array([n.reward_sq for n in nodes], dtype=np.float64),
+            amaf_visits=np.array([n.amaf_visits for n in nodes], dtype=np.float64),
+            amaf_reward=np.array([n.amaf_reward for n in nodes], dtype=np.float64),
+            best_score=np.array([n.best_score for n in nodes], dtype=np.float64),
+            moves=moves,
+            states=np.stack([encode_state(n.state) for n in nodes]),
+            has_best=has_best,
+            best_states=best_states,
+        )
+
+
+def load_tree(path):
+    """Rebuild an MCTSNode tree written by save_tree and return its root."""
+    with np.load(path) as npz:
+        data = {name: npz[name] for name in npz.files}
+    nodes = []
+    for i, parent in enumerate(data["parent"]):
+        move = decode_move(*data["moves"][i]) if parent >= 0 else None
+        node = MCTSNode(decode_state(data["states"][i]), parent=nodes[parent] if parent >= 0 else None, move=move)
+        node.visits = int(data["visits"][i])
+        node.reward = float(data["reward"][i])
+        node.reward_sq = float(data["reward_sq"][i])
+        node.amaf_visits = int(data["amaf_visits"][i])
+        node.amaf_reward = float(data["amaf_reward"][i])
+        node.best_score = float(data["best_score"][i])
+        if data["has_best"][i]:
+            node.best_state = decode_state(data["best_states"][i])
+        if node.parent is not None:
+            node.parent.children.append(node)
+        nodes.append(node)
+    return nodes[0]
+
+
+def assignments(state):
+    """Set of (house_index, attribute_type, value) moves already made in 'state'."""
+    return {(i, attr, value) for i, house in enumerate(state.houses) for attr, value in house.items()}
+
+
+def reroot(root, state):
+    """
+    Warm start: find the node of 'root' whose path assigns exactly the extra
+    values of the related partial 'state', and detach it as a new root
+    (keeping its statistics and subtree). Returns a fresh node if there is none.
+    """
+    base = assignments(root.state)
+    target = assignments(state)
+    if not base <= target:
+        return MCTSNode(state.clone())
+
+    needed = target - base
+    node, path = root, set()
+    while path != needed:
+        node = next((c for c in node.children if c.move in needed and c.move not in path), None)
+        if node is None:
+            return MCTSNode(state.clone())
+        path.add(node.move)
+
+    node.parent = None
+    node.move = None
+    node.state = state.clone()
+    return node
+
+# -------------------------------
+# ArrayTree trees
+# -------------------------------
+def save_array_tree(tree, path):
+    """Write the used part of an ArrayTree to 'path'."""
+    size = tree.size
+    has_state, states = encode_optional_states(tree.states[:size])
+    has_best, best_states = encode_optional_states(tree.best_states[:size])
+    arrays = {name: getattr(tree, name)[:size] for name in ArrayTree.FIELDS}
+    with open(path, "wb") as f:
+        np.savez_compressed(f, has_state=has_state, states=states,
+                            has_best=has_best, best_states=best_states, **arrays)
+
+
+def load_array_tree(path):
+    """Rebuild an ArrayTree written by save_array_tree."""
+    with np.load(path) as npz:
+        data = {name: npz[name] for name in npz.files}
+    size = len(data["visits"])
+    capacity = 1024
+    while capacity < size:
+        capacity *= 2
+
+    tree = ArrayTree(None, capacity=capacity)
+    for name in ArrayTree.FIELDS:
+        getattr(tree, name)[:size] = data[name]
+    for i in range(size):
+        if data["has_state"][i]:
+            tree.states[i] = decode_state(data["states"][i])
+        if data["has_best"][i]:
+            tree.best_states[i] = decode_state(data["best_states"][i])
+    tree.size = size
+    return tree
+
+
+def reroot_array(tree, state):
+    """
+    reroot() for an ArrayTree: the matching node's subtree is compacted into a
+    new ArrayTree rooted at 'state'. Returns an empty tree if there is no match.
+    """
+    base = assignments(tree.states[0])
+    target = assignments(state)
+    if not base <= target:
+        return ArrayTree(state.clone())
+
+    needed = target - base
+    node, path = 0, set()
+    while path != needed:
+        node = next((int(c) for c in tree.children(node)
+                     if tree.move(c) in needed and tree.move(c) not in path), None)
+        if node is None:
+            return ArrayTree(state.clone())
+        path.add(tree.move(node))
+
+    subtree = tree.subtree(node)
+    subtree.states[0] = state.clone()
+    return subtree
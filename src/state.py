@@ -1,17 +1,78 @@
 # src/state.py
+import hashlib
 from config import HOUSE_COUNT
 
+# (house_index, attribute, value) -> random 64-bit code, filled lazily
+_ZOBRIST_CODES = {}
+
+def _digest(key):
+    return int.from_bytes(hashlib.blake2b(repr(key).encode(), digest_size=8).digest(), "little")
+
+
+def zobrist_code(house_index, attr, value):
+    """
+    Zobrist code of one assignment. Derived from a hash of the assignment
+    itself, so codes are identical across processes and runs.
+    """
+    key = (house_index, attr, value)
+    try:
+        code = _ZOBRIST_CODES.get(key)
+    except TypeError:  # Unhashable value (e.g. malformed LLM output): don't cache
+        return _digest(key)
+    if code is None:
+        code = _ZOBRIST_CODES[key] = _digest(key)
+    return code
+
+
 class ZebraState:
     def __init__(self, houses=None):
         if houses is None:
             self.houses = [dict() for _ in range(HOUSE_COUNT)]
         else:
             self.houses = houses
+        self.zobrist = self.compute_zobrist()
+
+    def compute_zobrist(self):
+        """Full 64-bit Zobrist hash of the current assignments."""
+        code = 0
+        for i, house in enumerate(self.houses):
+            for attr, value in house.items():
+                code ^= zobrist_code(i, attr, value)
+        return code
+
+    def assign(self, house_index, attr, value):
+        """Set one attribute, updating the Zobrist hash in O(1)."""
+        house = self.houses[house_index]
+        if attr in house:
+            self.zobrist ^= zobrist_code(house_index, attr, house[attr])
+        house[attr] = value
+        self.zobrist ^= zobrist_code(house_index, attr, value)
+
+    def unassign(self, house_index, attr):
+        """Clear one attribute, updating the Zobrist hash in O(1)."""
+        house = self.houses[house_index]
+        if attr in house:
+            self.zobrist ^= zobrist_code(house_index, attr, house.pop(attr))
+
+    def key(self):
+        """Canonical, immutable, collision-free key for external caches."""
+        return tuple(tuple(sorted(house.items(), key=lambda item: item[0])) for house in self.houses)
+
+    def __hash__(self):
+        # 'houses' must only be changed through assign()/unassign(), which keep
+        # the cached hash in step; equal states then always hash alike.
+        return self.zobrist
+
+    def __eq__(self, other):
+        if not isinstance(other, ZebraState):
+            return NotImplemented
+        return self.zobrist == other.zobrist and self.houses == other.houses
 
     def clone(self):
         """Create a deep copy of the state."""
         new_state = ZebraState()
         new_state.houses = [h.copy() for h in self.houses]
+        new_state.zobrist = self.zobrist
         return new_state
 
     def get_neighbor_indices(self, index):
@@ -1,9 +1,15 @@
 import os
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+# Configured once per process and reused by every query
+_gemini_model = None
 
 def setup_gemini():
-    load_dotenv()
-    api_key = os.getenv("GEMINI_API_KEY")
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel("models/gemini-2.0-flash")
+    global _gemini_model
+    if _gemini_model is None:
+        import google.generativeai as genai  # Imported on first use: it is slow, and engine processes never need it
+        load_dotenv()
+        api_key = os.getenv("GEMINI_API_KEY")
+        genai.configure(api_key=api_key)
+        _gemini_model = genai.GenerativeModel("models/gemini-2.0-flash")
+    return _gemini_model
@@ -10,6 +10,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 's
 from state import ZebraState
 from mcts_solver import MCTSSolver
 from csp_solver import solve_csp
+from dlx_solver import solve_dlx
 from hybrid_solver import HybridMCTSSolver
 
 # ===============================
@@ -50,6 +51,22 @@ def test_csp(runs=5):
     return total_time / runs, (success / runs) * 100
 
 
+def test_dlx(runs=5):
+    success = 0
+    total_time = 0
+
+    for _ in range(runs):
+        start = time.time()
+        result = solve_dlx()
+        end = time.time()
+
+        total_time += (end - start)
+        if result:
+            success += 1
+
+    return total_time / runs, (success / runs) * 100
+
+
 def test_hybrid(runs=5):
     success = 0
     total_time = 0
@@ -80,6 +97,9 @@ def main():
     print("🔍 Benchmarking CSP solver...")
     csp_time, csp_success = test_csp(runs)
 
+    print("🔍 Benchmarking DLX solver...")
+    dlx_time, dlx_success = test_dlx(runs)
+
     print("🔍 Benchmarking Hybrid solver...")
     hybrid_time, hybrid_success = test_hybrid(runs)
 
@@ -88,6 +108,7 @@ def main():
         ["Algorithm", "Avg_Time(s)", "Success_Rate(%)"],
         ["MCTS + LLM", mcts_time, mcts_success],
         ["CSP Solver", csp_time, csp_success],
+        ["DLX Solver", dlx_time, dlx_success],
         ["Hybrid MCTS + CSP", hybrid_time, hybrid_success]
     ]
 
@@ -0,0 +1,53 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from csp_solver import backjump, complete_with_csp, NogoodStore
+from clues import ZEBRA_CLUES
+from dlx_solver import solve_dlx, count_dlx
+from hybrid_solver import HybridMCTSSolver
+from state import ZebraState
+
+
+def test_backjump_solves_from_scratch():
+    assert backjump([{} for _ in range(5)], nogoods=NogoodStore()) == solve_dlx()
+
+
+def test_backjump_agrees_with_dlx_on_partials():
+    partials = [
+        [{"pet": "zebra"}, {}, {}, {}, {}],
+        [{}, {}, {}, {}, {"color": "green", "pet": "zebra"}],
+        [{}, {"hobby": "reading"}, {}, {"drink": "water"}, {}],
+        [{"color": "yellow"}, {}, {}, {}, {"drink": "coffee"}],
+    ]
+    for partial in partials:
+        expected = solve_dlx(partial)
+        assert backjump(partial, nogoods=NogoodStore()) == expected
+        assert complete_with_csp(partial, backjumping=True) == expected
+
+
+def test_nogoods_are_learned_and_reused():
+    store = NogoodStore()
+    assert backjump([{"pet": "zebra"}, {}, {}, {}, {}], nogoods=store) is None
+    learned = store.count
+    assert learned > 0
+    assert all(len(n) <= store.max_size for ns in store.by_literal.values() for n in ns)
+
+    # Same question again: answered without learning anything new
+    assert backjump([{"pet": "zebra"}, {}, {}, {}, {}], nogoods=store) is None
+    assert store.count == learned
+
+
+def test_hybrid_with_backjumping():
+    solution = HybridMCTSSolver(iterations=20, backjumping=True).search(ZebraState())
+    assert solution.is_valid()
+    assert all(len(h) == 5 for h in solution.houses)
+
+
+def test_backjump_rejects_repeated_values():
+    partial = [{}, {}, {}, {"drink": "coffee", "pet": "fox"}, {"pet": "fox"}]
+    clues = ZEBRA_CLUES[:-4]
+    assert count_dlx(partial, clues=clues) == 0
+    assert backjump(partial, clues=clues, nogoods=NogoodStore()) is None
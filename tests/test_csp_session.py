@@ -0,0 +1,63 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from clues import Clue, ZEBRA_CLUES, clues_hold
+from csp_solver import CSPSession
+from dlx_solver import solve_dlx
+
+
+def test_session_matches_full_solve():
+    session = CSPSession(ZEBRA_CLUES)
+    assert session.solve() == solve_dlx()
+
+
+def test_clues_added_one_by_one():
+    session = CSPSession()
+    for clue in ZEBRA_CLUES:
+        session.add_clue(clue)
+        solution = session.solve()
+        assert clues_hold(session.clues, solution)
+    assert solution == solve_dlx()
+    # Clues that the running solution already satisfied did not trigger a search
+    assert session.searches < len(ZEBRA_CLUES)
+
+
+def test_consistent_change_reuses_solution():
+    session = CSPSession(ZEBRA_CLUES[:-3])
+    solution = session.solve()
+    searches = session.searches
+
+    session.add_clue(Clue("position", ("color", solution[4]["color"]), 4))
+    session.fix(1, "pet", solution[1]["pet"])
+    assert session.solve() == solution
+    assert session.searches == searches
+
+
+def test_remove_and_unfix_rebuild_domains():
+    session = CSPSession(ZEBRA_CLUES)
+    session.fix(0, "pet", "zebra")
+    assert session.solve() is None
+
+    session.remove_clue(ZEBRA_CLUES[0])
+    solution = session.solve()
+    assert solution[0]["pet"] == "zebra"
+
+    session.unfix(0, "pet")
+    session.add_clue(ZEBRA_CLUES[0])
+    assert session.solve() == solve_dlx()
+
+
+def test_refixing_a_slot_replaces_the_old_value():
+    session = CSPSession(ZEBRA_CLUES[:-3])
+    session.fix(4, "pet", "zebra")
+    session.fix(4, "pet", "dog")
+
+    fresh = CSPSession(ZEBRA_CLUES[:-3])
+    fresh.fix(4, "pet", "dog")
+    solution = session.solve()
+    assert solution is not None and fresh.solve() is not None
+    assert solution[4]["pet"] == "dog"
+    assert session.domains == fresh.domains
@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from clues import ZEBRA_CLUES, clue_to_json, clue_from_json, clues_hold
+from dlx_solver import solve_dlx, enumerate_dlx, count_dlx
+from state import ZebraState
+
+
+def test_dlx_finds_the_unique_solution():
+    solution = solve_dlx()
+    assert ZebraState(solution).is_valid()
+    assert clues_hold(ZEBRA_CLUES, solution)
+    water = next(h for h in solution if h["drink"] == "water")
+    zebra = next(h for h in solution if h["pet"] == "zebra")
+    assert water["nationality"] == "norwegian"
+    assert zebra["nationality"] == "japanese"
+    assert count_dlx() == 1
+
+
+def test_dlx_counts_and_enumerates_underconstrained_puzzles():
+    clues = ZEBRA_CLUES[:-3]
+    solutions = list(enumerate_dlx(clues=clues))
+    assert len(solutions) == count_dlx(clues=clues) > 1
+    assert all(clues_hold(clues, s) for s in solutions)
+    assert count_dlx(clues=clues, limit=2) == 2
+
+
+def test_dlx_respects_partial_assignments():
+    partial = [{}, {}, {"drink": "milk"}, {}, {}]
+    assert solve_dlx(partial) == solve_dlx()
+    assert solve_dlx([{"color": "red"}, {}, {}, {}, {}]) is None
+
+
+def test_clue_json_roundtrip():
+    assert [clue_from_json(clue_to_json(c)) for c in ZEBRA_CLUES] == ZEBRA_CLUES
@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from clues import clue_from_json, clues_hold
+from dlx_solver import count_dlx
+from generator import generate_instance, write_instances, load_instances, make_attributes
+
+
+def test_generated_instance_is_unique_and_minimal():
+    instance = generate_instance(house_count=4, attribute_count=4, seed=3)
+    clues = [clue_from_json(c) for c in instance["clues"]]
+    attributes = instance["attributes"]
+
+    assert clues_hold(clues, instance["solution"])
+    assert count_dlx(clues=clues, attributes=attributes, house_count=4) == 1
+    # Every remaining clue is needed
+    for clue in clues:
+        rest = [c for c in clues if c != clue]
+        assert count_dlx(clues=rest, attributes=attributes, house_count=4, limit=2) == 2
+
+
+def test_generation_is_reproducible():
+    assert generate_instance(4, 3, seed=7) == generate_instance(4, 3, seed=7)
+    assert generate_instance(4, 3, seed=7) != generate_instance(4, 3, seed=8)
+
+
+def test_make_attributes_sizes():
+    attributes = make_attributes(house_count=6, attribute_count=7)
+    assert len(attributes) == 7
+    assert all(len(values) == len(set(values)) == 6 for values in attributes.values())
+    assert attributes["color"][:5] == ["red", "green", "ivory", "yellow", "blue"]
+
+
+def test_jsonl_roundtrip(tmp_path):
+    path = tmp_path / "instances.jsonl"
+    write_instances(path, count=3, house_count=3, attribute_count=3, seed=10)
+    instances = list(load_instances(path))
+    assert [i["seed"] for i in instances] == [10, 11, 12]
+    for instance in instances:
+        assert count_dlx(clues=instance["clues"], attributes=instance["attributes"], house_count=3) == 1
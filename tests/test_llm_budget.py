@@ -0,0 +1,114 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import mcts_solver
+from clues import ZEBRA_CLUES
+from csp_solver import complete_with_csp
+from dlx_solver import solve_dlx
+from llm_utils import LLMBudget
+from mcts_solver import MCTSSolver
+from mcts_tree import reward_variance
+from rollout_policy import HeuristicRolloutPolicy
+from state import ZebraState
+
+
+def test_reward_variance():
+    assert reward_variance(1, 0.5, 0.25) == 0.0
+    assert reward_variance(2, 1.0, 1.0) == 0.25      # Rewards 0 and 1
+    assert reward_variance(4, 2.0, 1.0) == 0.0       # Four rewards of 0.5
+
+
+def test_budget_targets_uncertain_nodes_and_stuck_states():
+    budget = LLMBudget(max_calls=None, min_visits=3, min_variance=0.01, max_failures=2)
+    assert not budget.should_call("a", visits=0)
+    assert not budget.should_call("a", visits=10, variance=0.0)
+    assert budget.should_call("a", visits=10, variance=0.1)
+
+    budget.record_failure("b")
+    assert not budget.should_call("b")
+    budget.record_failure("b")
+    assert budget.should_call("b")
+    budget.record_call("b", reward=0.8, baseline=0.5)
+    assert not budget.should_call("b")                # Retried only after new failures
+
+
+def test_budget_caps_and_pacing():
+    budget = LLMBudget(max_calls=2, min_visits=0, min_variance=0.0)
+    for _ in range(2):
+        assert budget.should_call("a")
+        budget.record_call("a", 1.0, 0.5, tokens=10)
+    assert not budget.should_call("a")
+
+    budget = LLMBudget(max_calls=None, max_tokens=100, min_visits=0, min_variance=0.0)
+    budget.record_call("a", 1.0, 0.5, tokens=150)
+    assert not budget.should_call("a")
+
+    budget = LLMBudget(max_calls=10, min_visits=0, min_variance=0.0)
+    budget.reset(horizon=100)
+    calls = 0
+    for _ in range(20):                               # First 20% of the search
+        if budget.should_call("a"):
+            budget.record_call("a", 1.0, 0.5)
+            calls += 1
+    assert calls <= 10 * 20 / 100 + 1
+
+
+def test_solver_spends_budget_and_reports_gain(monkeypatch):
+    def fake_gemini(houses, retries=2, usage=None):
+        usage["tokens"] = usage.get("tokens", 0) + 100
+        return complete_with_csp([dict(h) for h in houses])
+
+    monkeypatch.setattr(mcts_solver, "query_gemini_api", fake_gemini)
+    budget = LLMBudget(max_calls=3, min_visits=1, min_variance=0.0, max_failures=1)
+    solver = MCTSSolver(iterations=50, rollout_policy=HeuristicRolloutPolicy(seed=0), llm_budget=budget)
+    solver.search(ZebraState())
+
+    report = budget.report()
+    assert 0 < report["calls"] <= 3
+    assert report["tokens"] == 100 * report["calls"]
+    assert report["rollouts"] >= report["calls"]
+    assert set(report) >= {"value_gained", "value_per_call", "valid_calls", "seconds"}
+    assert report["value_gained"] >= 0               # Correct answers never score below the heuristic
+
+
+def test_budget_keeps_spending_below_the_root_on_one_reward_scale(monkeypatch):
+    solver = MCTSSolver(iterations=200, rollout_policy=HeuristicRolloutPolicy(seed=0), llm_budget=LLMBudget())
+    root_expanded_at_call = []
+    rewards = []
+
+    def fake_gemini(houses, retries=2, usage=None):
+        root_expanded_at_call.append(solver.root.is_fully_expanded())
+        return complete_with_csp([dict(h) for h in houses])
+
+    backpropagate = solver.backpropagate
+
+    def record(node, reward):
+        rewards.append(reward)
+        backpropagate(node, reward)
+
+    monkeypatch.setattr(mcts_solver, "query_gemini_api", fake_gemini)
+    monkeypatch.setattr(solver, "backpropagate", record)
+    solver.search(ZebraState())
+
+    assert root_expanded_at_call.count(True) >= 5
+    assert solver.llm_budget.report()["rollouts"] == 200
+    # LLM and heuristic rollouts share one scale: 1 for a valid solution, clue fractions below it
+    steps = len(ZEBRA_CLUES) + 1
+    assert all(r == 1.0 or abs(r * steps - round(r * steps)) < 1e-9 and r < 1 for r in rewards)
+    assert 1.0 in rewards
+
+
+def test_valid_heuristic_completion_is_not_a_failure():
+    budget = LLMBudget(max_calls=0)
+    solved = lambda state: (ZebraState(solve_dlx()), 1.0)
+    reward, _ = MCTSSolver(rollout_policy=solved, llm_budget=budget).simulate(ZebraState())
+    assert reward == 1.0
+    assert budget.failures == {}
+
+    unsolved = lambda state: (ZebraState(), 0.0)
+    reward, _ = MCTSSolver(rollout_policy=unsolved, llm_budget=budget).simulate(ZebraState())
+    assert reward < 1.0
+    assert list(budget.failures.values()) == [1]
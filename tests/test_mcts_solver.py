@@ -0,0 +1,63 @@
+import os
+import sys
+import random
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from hybrid_solver import HybridMCTSSolver
+import mcts_solver
+from mcts_solver import MCTSSolver, generate_mrv_moves
+from portfolio import is_solution
+from rollout_policy import HeuristicRolloutPolicy
+from state import ZebraState
+
+
+def test_mrv_moves_pick_pinned_slot():
+    moves = generate_mrv_moves(ZebraState())
+    assert len(moves) == 1
+    assert moves[0] in [(2, "drink", "milk"), (0, "nationality", "norwegian")]
+
+    state = ZebraState()
+    state.assign(2, "drink", "water")
+    assert generate_mrv_moves(state) == []
+
+
+def test_solvers_with_mrv_moves():
+    solver = MCTSSolver(iterations=30, rollout_policy=HeuristicRolloutPolicy(seed=0), mrv_moves=True)
+    assert solver.search(ZebraState()) is not None
+
+    solution = HybridMCTSSolver(iterations=20, mrv_moves=True).search(ZebraState())
+    assert solution.is_valid()
+    assert all(len(h) == 5 for h in solution.houses)
+
+
+def depth(node):
+    return max((1 + depth(child) for child in node.children), default=0)
+
+
+def test_mrv_search_grows_deep_and_solves_at_least_as_often():
+    solved = {}
+    for mrv in (False, True):
+        solved[mrv] = 0
+        for seed in range(5):
+            random.seed(seed)
+            solver = MCTSSolver(iterations=50, rollout_policy=HeuristicRolloutPolicy(seed=seed), mrv_moves=mrv)
+            solved[mrv] += is_solution(solver.search(ZebraState()))
+            assert depth(solver.root) > 1
+    assert solved[True] >= solved[False]
+    assert solved[True] > 0
+
+
+def test_moves_are_generated_once_per_node(monkeypatch):
+    calls = []
+
+    def counting_mrv(state):
+        calls.append(state.key())
+        return generate_mrv_moves(state)
+
+    monkeypatch.setattr(mcts_solver, "generate_mrv_moves", counting_mrv)
+    solver = MCTSSolver(iterations=30, rollout_policy=HeuristicRolloutPolicy(seed=0), mrv_moves=True)
+    solver.search(ZebraState())
+    nodes = 1 + sum(len(v) for v in solver.move_index.values())
+    assert len(calls) <= nodes
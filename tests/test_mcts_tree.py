@@ -0,0 +1,138 @@
+import os
+import sys
+import random
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import mcts_solver
+from llm_utils import query_mock_llm
+from mcts_solver import MCTSNode, MCTSSolver, generate_possible_moves
+from mcts_tree import ArrayTree, encode_move, decode_move
+from dlx_solver import solve_dlx
+from state import ZebraState
+
+
+def test_move_encoding_roundtrip():
+    move = (3, "drink", "orange juice")
+    assert decode_move(*encode_move(move)) == move
+
+
+def test_array_tree_grows_geometrically():
+    tree = ArrayTree(ZebraState(), capacity=4)
+    moves = generate_possible_moves(ZebraState())
+    first = tree.add_children(0, moves)
+    tree.add_children(first, moves)
+    assert tree.size == 1 + 2 * len(moves)
+    assert tree.capacity == 16
+    assert list(tree.children(0)) == list(range(1, 6))
+    assert tree.move(first) == moves[0]
+
+
+def test_best_child_matches_scalar_uct(monkeypatch):
+    moves = generate_possible_moves(ZebraState())
+    tree = ArrayTree(ZebraState())
+    start = tree.add_children(0, moves)
+    root = MCTSNode(ZebraState())
+    root.children = [MCTSNode(ZebraState(), parent=root, move=m) for m in moves]
+
+    # Same statistics in both trees: plain rewards plus AMAF credit on some children
+    results = [(0, 0.2), (1, 0.9), (2, 0.5), (3, 0.1), (4, 0.4), (2, 0.5), (0, 0.3), (0, 0.1)]
+    for i, reward in results:
+        tree.backpropagate(start + i, reward)
+        MCTSSolver().backpropagate(root.children[i], reward)
+    for i, reward in [(3, 1.0), (3, 1.0), (4, 0.8), (1, 0.0)]:
+        tree.amaf_visits[start + i] += 1
+        tree.amaf_rewards[start + i] += reward
+        root.children[i].amaf_visits += 1
+        root.children[i].amaf_reward += reward
+
+    assert tree.is_fully_expanded(0)
+    # Python-float path for narrow blocks, NumPy path once the block counts as wide
+    for min_children in (ArrayTree.VECTOR_MIN_CHILDREN, 1):
+        monkeypatch.setattr(ArrayTree, "VECTOR_MIN_CHILDREN", min_children)
+        for c_param in (0.0, 0.5, 1.4, 5.0):
+            for rave_k in (None, 1, 500):
+                expected = root.children.index(root.best_child(c_param, rave_k=rave_k))
+                assert tree.best_child(0, c_param, rave_k=rave_k) == start + expected
+    # Highest mean reward wins once exploration terms are comparable
+    assert tree.best_child(0) == start + 1
+
+
+def test_array_search_returns_state(monkeypatch):
+    monkeypatch.setattr(mcts_solver, "query_gemini", query_mock_llm)
+    solution = MCTSSolver(iterations=30, array_tree=True).search(ZebraState())
+    assert solution is not None
+    assert sum(len(h) for h in solution.houses) == 25
+
+
+def test_amaf_credits_moves_seen_in_rollout():
+    completed = ZebraState(query_mock_llm(ZebraState().houses))
+    first_color = completed.houses[0]["color"]
+    moves = generate_possible_moves(ZebraState())
+
+    # Two branches assigning house 0's color; the rollout went through neither
+    tree = ArrayTree(ZebraState())
+    start = tree.add_children(0, moves)
+    deeper = tree.add_children(start, moves)
+    tree.update_amaf(completed, 0.7)
+
+    credited = [tree.move(c)[2] for c in range(1, tree.size) if tree.amaf_visits[c] == 1]
+    assert credited == [first_color, first_color]
+    assert tree.amaf_rewards[:tree.size].sum() == 1.4
+
+    solver = MCTSSolver(rave=True)
+    root = MCTSNode(ZebraState())
+    solver.move_index = {}
+    for _ in range(2):
+        solver.expand(root)
+    for child in list(root.children):
+        for _ in range(2):
+            solver.expand(child)
+    solver.update_amaf(completed, 0.7)
+    nodes = solver.index_moves(root)
+    assert sum(len(v) for v in nodes.values()) == 6
+    for move, matching in nodes.items():
+        expected = 1 if completed.houses[move[0]].get(move[1]) == move[2] else 0
+        assert all(n.amaf_visits == expected for n in matching)
+
+
+def test_rave_search_returns_state(monkeypatch):
+    monkeypatch.setattr(mcts_solver, "query_gemini", query_mock_llm)
+    for array_tree in (False, True):
+        solver = MCTSSolver(iterations=30, array_tree=array_tree, rave=True, rave_k=50)
+        solution = solver.search(ZebraState())
+        assert solution is not None
+        assert sum(len(h) for h in solution.houses) == 25
+
+
+def test_rave_statistics_differ_and_converge_faster(monkeypatch):
+    monkeypatch.setattr(mcts_solver, "query_gemini", query_mock_llm)
+
+    # Below the root, AMAF also counts rollouts from other branches
+    for array_tree in (False, True):
+        random.seed(0)
+        solver = MCTSSolver(iterations=100, array_tree=array_tree, rave=True)
+        solver.search(ZebraState())
+        if array_tree:
+            tree = solver.tree
+            assert tree.child_count[tree.children(0)].max() > 0   # Deeper than one level
+            assert (tree.amaf_visits[1:tree.size] != tree.visits[1:tree.size]).any()
+        else:
+            nodes = [n for moves in solver.move_index.values() for n in moves]
+            assert max(c.visits for n in nodes for c in n.children) > 0
+            assert any(n.amaf_visits != n.visits for n in nodes)
+
+    # Most visited first move equals the true one more often with RAVE at a third of the iterations
+    truth = solve_dlx()
+
+    def first_move_correct(rave, iterations, seed):
+        random.seed(seed)
+        solver = MCTSSolver(iterations=iterations, rave=rave)
+        solver.search(ZebraState())
+        house_index, attr, value = max(solver.root.children, key=lambda c: c.visits).move
+        return truth[house_index][attr] == value
+
+    plain = sum(first_move_correct(False, 300, seed) for seed in range(10))
+    rave = sum(first_move_correct(True, 100, seed) for seed in range(10))
+    assert rave > plain
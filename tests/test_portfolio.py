@@ -0,0 +1,56 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import portfolio
+from portfolio import PortfolioSolver, solve_portfolio, instance_shape
+from state import ZebraState
+
+
+def test_process_race_returns_valid_solution():
+    solution, winner = solve_portfolio(engines=("csp", "dlx"))
+    assert solution.is_valid()
+    assert all(len(h) == 5 for h in solution.houses)
+    assert winner in ("csp", "dlx")
+
+
+def test_thread_race_skips_failing_engines(monkeypatch):
+    monkeypatch.setitem(portfolio.ENGINES, "broken", lambda state: state)
+    solver = PortfolioSolver(engines=("broken", "dlx"), use_processes=False)
+    assert solver.solve().is_valid()
+    assert solver.last_winner == "dlx"
+
+
+def test_priors_skip_the_race_once_confident(monkeypatch):
+    solver = PortfolioSolver(engines=("csp", "dlx"), use_processes=False, min_races=3, confidence=0.5)
+    shape = instance_shape(ZebraState())
+    for _ in range(3):
+        solver.solve()
+    winner = solver.pick_engine(shape)
+    assert winner in ("csp", "dlx")
+
+    def no_race(state, timeout=None):
+        raise AssertionError("should not race")
+
+    monkeypatch.setattr(solver, "race_threads", no_race)
+    assert solver.solve().is_valid()
+    assert solver.last_winner == winner
+    assert solver.races[shape] == 3
+
+
+def test_raising_prior_engine_falls_back_to_race(monkeypatch):
+    def explode(state):
+        raise RuntimeError("engine crashed")
+
+    monkeypatch.setitem(portfolio.ENGINES, "flaky", explode)
+    solver = PortfolioSolver(engines=("flaky", "dlx"), use_processes=False, min_races=1, confidence=0.5)
+    shape = instance_shape(ZebraState())
+    solver.races[shape] = 1
+    solver.stats[shape] = {"flaky": {"wins": 1, "time": 0.0}}
+
+    assert solver.pick_engine(shape) == "flaky"
+    assert solver.solve().is_valid()
+    assert solver.last_winner == "dlx"
+    assert solver.races[shape] == 2
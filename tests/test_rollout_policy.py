@@ -0,0 +1,42 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from csp_solver import init_domains, prune_domains
+from mcts_solver import MCTSSolver
+from rollout_policy import HeuristicRolloutPolicy
+from state import ZebraState
+
+
+def test_prune_domains_applies_clues():
+    solution = [{} for _ in range(5)]
+    domains = init_domains(solution)
+    assert prune_domains(solution, domains)
+    assert domains[2]["drink"] == {"milk"}
+    assert domains[0]["nationality"] == {"norwegian"}
+
+
+def test_rollout_returns_full_completion_and_reward():
+    policy = HeuristicRolloutPolicy(seed=0)
+    completed, reward = policy(ZebraState())
+    assert all(len(h) == 5 for h in completed.houses)
+    assert 0 < reward <= 1
+    # The clue-pinned slots are always respected
+    assert completed.houses[2]["drink"] == "milk"
+    assert completed.houses[0]["nationality"] == "norwegian"
+
+
+def test_rollout_reward_is_zero_for_invalid_partial():
+    state = ZebraState()
+    state.assign(2, "drink", "water")
+    _, reward = HeuristicRolloutPolicy(seed=0)(state)
+    assert reward == 0
+
+
+def test_mcts_with_heuristic_rollouts():
+    solver = MCTSSolver(iterations=30, rollout_policy=HeuristicRolloutPolicy(epsilon=0.1, seed=0))
+    solution = solver.search(ZebraState())
+    assert solution is not None
+    assert all(len(h) == 5 for h in solution.houses)
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import time
+import queue
+import threading
+import urllib.request
+import urllib.error
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from dlx_solver import solve_dlx
+from service import SolverService, serve
+from state import ZebraState
+
+
+def test_service_caches_results():
+    service = SolverService(workers=2)
+    first = service.solve("dlx")
+    second = service.solve("dlx", ZebraState())
+    assert first.solution.houses == solve_dlx()
+    assert not first.cached and second.cached
+
+    stats = service.stats()
+    assert stats["completed"] == 2
+    assert stats["cache_hits"] == 1
+    assert stats["solvers"]["dlx"]["count"] == 1
+
+
+def test_queue_is_bounded_and_deadlines_expire():
+    service = SolverService(workers=0, queue_size=1)
+    job = service.submit("csp", deadline=0)
+    with pytest.raises(queue.Full):
+        service.submit("csp")
+    with pytest.raises(KeyError):
+        service.submit("nope")
+
+    service.run(job)
+    assert job.error == "deadline exceeded"
+    assert service.stats()["rejected"] == 1
+
+
+def test_http_endpoints():
+    service = SolverService(workers=1)
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        body = json.dumps({"solver": "dlx", "state": [{}, {}, {"drink": "milk"}, {}, {}], "deadline": 10}).encode()
+        with urllib.request.urlopen(urllib.request.Request(url + "/solve", data=body)) as response:
+            result = json.load(response)
+        assert result["valid"] and result["solution"] == solve_dlx()
+
+        with urllib.request.urlopen(url + "/stats") as response:
+            assert json.load(response)["completed"] == 1
+
+        for bad in (b'{"solver": "nope"}', b'{"state": [{"color": ["x"]}, {}, {}, {}, {}]}'):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(urllib.request.Request(url + "/solve", data=bad))
+            assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_jobs_overrunning_their_deadline_expire(monkeypatch):
+    service = SolverService(workers=0)
+
+    def slow(state):
+        time.sleep(0.3)
+        return ZebraState(solve_dlx())
+
+    monkeypatch.setitem(service.solvers, "slow", slow)
+    job = service.submit("slow", deadline=0.1)
+    service.run(job)
+    stats = service.stats()
+    assert job.error == "deadline exceeded" and job.solution is None
+    assert stats["expired"] == 1 and stats["completed"] == 0
+    assert stats["cache_entries"] == 0
+
+
+def test_portfolio_races_get_the_remaining_time(monkeypatch):
+    service = SolverService(workers=0)
+    timeouts = []
+
+    def solve(state, timeout=None):
+        timeouts.append(timeout)
+        return ZebraState(solve_dlx())
+
+    monkeypatch.setattr(service.portfolio, "solve", solve)
+    job = service.submit("portfolio", deadline=5)
+    service.run(job)
+    assert job.solution.is_valid()
+    assert 0 < timeouts[0] <= 5
+
+
+def test_malformed_job_does_not_kill_the_worker():
+    service = SolverService(workers=1)
+    bad = service.solve("dlx", ZebraState([{"color": ["x"]}, {}, {}, {}, {}]))  # Unhashable cache key
+    assert bad.error and bad.solution is None
+    assert service.stats()["failed"] == 1
+
+    good = service.solve("dlx", deadline=10)
+    assert good.error is None and good.solution.houses == solve_dlx()
+    assert all(worker.is_alive() for worker in service.workers)
+
+
+def test_portfolio_races_run_from_worker_threads():
+    service = SolverService(workers=2)
+    jobs = [service.submit("portfolio", ZebraState(), deadline=60) for _ in range(2)]
+    for job in jobs:
+        job.done.wait()
+        assert job.error is None and job.solution.is_valid()
@@ -0,0 +1,110 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from hybrid_solver import HybridMCTSSolver
+from mcts_solver import MCTSSolver
+from rollout_policy import HeuristicRolloutPolicy
+from snapshot import save_tree, load_tree, reroot, reroot_array, save_array_tree, load_array_tree
+from state import ZebraState
+
+
+def walk(node):
+    yield node
+    for child in node.children:
+        yield from walk(child)
+
+
+def test_tree_roundtrip(tmp_path):
+    solver = MCTSSolver(iterations=40, rollout_policy=HeuristicRolloutPolicy(seed=0), rave=True)
+    solver.search(ZebraState())
+    path = tmp_path / "tree.npz"
+    save_tree(solver.root, path)
+
+    loaded = load_tree(path)
+    original = list(walk(solver.root))
+    restored = list(walk(loaded))
+    assert len(restored) == len(original)
+    assert [n.move for n in restored] == [n.move for n in original]
+    assert [n.visits for n in restored] == [n.visits for n in original]
+    assert [n.amaf_visits for n in restored] == [n.amaf_visits for n in original]
+    assert [n.state.houses for n in restored] == [n.state.houses for n in original]
+    assert loaded.best_state.houses == solver.root.best_state.houses
+
+
+def test_resume_continues_statistics(tmp_path):
+    solver = HybridMCTSSolver(iterations=10, mrv_moves=True)
+    solver.search(ZebraState())
+    path = tmp_path / "hybrid.npz"
+    save_tree(solver.root, path)
+
+    resumed = HybridMCTSSolver(iterations=10, mrv_moves=True)
+    resumed.search(ZebraState(), root=load_tree(path))
+    assert resumed.root.visits == solver.root.visits + 10
+
+
+def test_reroot_reuses_matching_subtree():
+    solver = HybridMCTSSolver(iterations=10, mrv_moves=True)
+    solver.search(ZebraState())
+    child = solver.root.children[0]
+
+    related = ZebraState()
+    related.assign(*child.move)
+    new_root = reroot(solver.root, related)
+    assert new_root is child
+    assert new_root.parent is None
+    assert new_root.state.houses == related.houses
+
+    unrelated = ZebraState()
+    unrelated.assign(4, "pet", "zebra")
+    assert reroot(solver.root, unrelated).visits == 0
+
+
+def test_array_tree_roundtrip(tmp_path):
+    solver = MCTSSolver(iterations=30, array_tree=True, rollout_policy=HeuristicRolloutPolicy(seed=0))
+    solver.search(ZebraState())
+    path = tmp_path / "array.npz"
+    save_array_tree(solver.tree, path)
+
+    tree = load_array_tree(path)
+    assert tree.size == solver.tree.size
+    assert (tree.visits[:tree.size] == solver.tree.visits[:tree.size]).all()
+    assert tree.states[1].houses == solver.tree.states[1].houses
+    assert tree.best_states[0].houses == solver.tree.best_states[0].houses
+
+    MCTSSolver(iterations=5, array_tree=True, rollout_policy=HeuristicRolloutPolicy(seed=0)).search(ZebraState(), root=tree)
+    assert tree.visits[0] == solver.tree.visits[0] + 5
+
+
+def test_reroot_array_compacts_matching_subtree():
+    solver = MCTSSolver(iterations=60, array_tree=True, rollout_policy=HeuristicRolloutPolicy(seed=0))
+    solver.search(ZebraState())
+    tree = solver.tree
+    child = max(tree.children(0), key=lambda c: tree.visits[c])
+    grandchild = max(tree.children(child), key=lambda c: tree.visits[c])
+
+    related = ZebraState()
+    for node in (child, grandchild):
+        related.assign(*tree.move(node))
+    new = reroot_array(tree, related)
+    assert new.parent[0] == -1
+    assert new.states[0].houses == related.houses
+    assert new.visits[0] == tree.visits[grandchild]
+    assert new.best_states[0] is tree.best_states[grandchild]
+
+    # Same subtree shape, statistics and moves, with parents pointing inside the new tree
+    def shape(t, node):
+        return [(t.visits[c], t.move(c), shape(t, int(c))) for c in t.children(node)]
+    assert shape(tree, grandchild)
+    assert shape(new, 0) == shape(tree, grandchild)
+    assert all(new.parent[c] == 0 for c in new.children(0))
+    assert new.size < tree.size
+
+    MCTSSolver(iterations=5, array_tree=True, rollout_policy=HeuristicRolloutPolicy(seed=0)).search(related, root=new)
+    assert new.visits[0] == tree.visits[grandchild] + 5
+
+    unrelated = ZebraState()
+    unrelated.assign(4, "pet", "zebra")
+    assert reroot_array(tree, unrelated).size == 1
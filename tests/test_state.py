@@ -0,0 +1,53 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from dlx_solver import solve_dlx
+from mcts_solver import apply_move
+from state import ZebraState
+
+
+def test_incremental_hash_matches_full_recompute():
+    state = ZebraState()
+    empty_hash = hash(state)
+    state.assign(0, "color", "yellow")
+    state.assign(2, "drink", "milk")
+    state.assign(0, "color", "red")       # Overwrite XORs the old value out
+    assert state.zobrist == state.compute_zobrist()
+
+    state.unassign(0, "color")
+    state.unassign(2, "drink")
+    state.unassign(2, "drink")            # Unsetting an empty slot is a no-op
+    assert hash(state) == empty_hash == 0
+
+
+def test_hash_is_independent_of_assignment_order():
+    a = apply_move(apply_move(ZebraState(), (0, "pet", "fox")), (1, "hobby", "reading"))
+    b = apply_move(apply_move(ZebraState(), (1, "hobby", "reading")), (0, "pet", "fox"))
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a.key() == b.key()
+    assert len({a, b, ZebraState()}) == 2
+
+
+def test_clone_keeps_hash_and_equality():
+    state = ZebraState(solve_dlx())
+    copy = state.clone()
+    assert copy == state and hash(copy) == hash(state)
+    copy.assign(4, "pet", "dog")
+    assert copy != state
+    assert copy.zobrist == copy.compute_zobrist()
+
+
+def test_equal_states_hash_alike_however_built():
+    built = ZebraState([{}, {}, {"drink": "milk"}, {}, {}])
+    assigned = apply_move(ZebraState(), (2, "drink", "milk"))
+    undone = apply_move(assigned, (0, "pet", "fox"))
+    undone.unassign(0, "pet")
+    for state in (assigned, undone):
+        assert state == built
+        assert hash(state) == hash(built)
+    assert len({built, assigned, undone}) == 1
+    assert built != ZebraState()